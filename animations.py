@@ -0,0 +1,282 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_DIR = os.path.join(".cache", "lottie")
+VENDOR_DIR = "lottie"  # animations committed to the repo for offline deployments
+CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+TIMEOUT = (3.05, 5)  # (connect, read) seconds
+
+# Every animation the app shows, by name, so they can be prefetched and vendored
+ANIMATIONS = {
+    "thesis_writer": "https://assets5.lottiefiles.com/packages/lf20_khzniaya.json",
+    "resume_ats_score": "https://assets5.lottiefiles.com/private_files/lf30_gcroxmje.json",
+    "code_explainer": "https://assets5.lottiefiles.com/packages/lf20_CTaizi.json",
+    "healerbeast_bff": "https://assets1.lottiefiles.com/private_files/lf30_bb9bkg1h.json",
+    "qanda": "https://assets2.lottiefiles.com/packages/lf20_zw0djhar.json",
+    "transcription": "https://assets1.lottiefiles.com/packages/lf20_wc1wtcet.json",
+    "contact_form": "https://assets9.lottiefiles.com/packages/lf20_u25cckyh.json",
+    "contact_info": "https://assets3.lottiefiles.com/packages/lf20_fclga8fl.json",
+    "contact_success": "https://assets2.lottiefiles.com/packages/lf20_touohxv0.json",
+    "hero_coding": "https://assets10.lottiefiles.com/packages/lf20_vnikrcia.json",
+}
+_NAME_BY_URL = {url: name for name, url in ANIMATIONS.items()}
+
+fallback_icon = {
+    "v": "5.5.7",
+    "fr": 60,
+    "ip": 0,
+    "op": 60,
+    "w": 100,
+    "h": 100,
+    "nm": "Fallback",
+    "ddd": 0,
+    "assets": [],
+    "layers": [{
+        "ddd": 0,
+        "ind": 1,
+        "ty": 4,
+        "nm": "Shape Layer 1",
+        "sr": 1,
+        "ks": {
+            "o": {"a": 0, "k": 100, "ix": 11},
+            "r": {"a": 0, "k": 0, "ix": 10},
+            "p": {"a": 0, "k": [50, 50, 0], "ix": 2},
+            "a": {"a": 0, "k": [0, 0, 0], "ix": 1},
+            "s": {"a": 0, "k": [100, 100, 100], "ix": 6}
+        },
+        "ao": 0,
+        "shapes": [{
+            "ty": "rc",
+            "d": 1,
+            "s": {"a": 0, "k": [50, 50], "ix": 2},
+            "p": {"a": 0, "k": [0, 0], "ix": 3},
+            "r": {"a": 0, "k": 0, "ix": 4},
+            "nm": "Rectangle Path 1",
+            "mn": "ADBE Vector Shape - Rect",
+            "hd": False
+        }],
+        "ip": 0,
+        "op": 60,
+        "st": 0,
+        "bm": 0
+    }]
+}
+
+
+def make_session():
+    """A pooled session with bounded retries, shared by every animation fetch."""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class AnimationCache:
+    """Lottie JSON cache backed by memory and disk, refreshed in the background.
+
+    `get` never waits on the network: it returns the cached animation (even if
+    its TTL has expired) or `fallback_icon`, and schedules a refresh for
+    anything missing or stale.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL, max_workers=4):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.session = make_session()
+        self._memory = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lottie")
+
+    def path_for(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def vendored_path(self, url):
+        name = _NAME_BY_URL.get(url)
+        return os.path.join(VENDOR_DIR, f"{name}.json") if name else None
+
+    def is_cached(self, url):
+        """True if a copy within the TTL is cached, so prefetch still refreshes expired ones."""
+        fetched_at, data = self._lookup(url)
+        return data is not None and time.time() - fetched_at <= self.ttl
+
+    def get(self, url):
+        fetched_at, data = self._lookup(url)
+        if data is None or time.time() - fetched_at > self.ttl:
+            self.refresh_async(url)
+        return data if data is not None else fallback_icon
+
+    def _lookup(self, url):
+        with self._lock:
+            if url in self._memory:
+                return self._memory[url]
+        vendored = self.vendored_path(url)
+        if vendored and os.path.exists(vendored):
+            # Vendored copies never expire, so they're never refetched
+            path, fetched_at = vendored, float("inf")
+        else:
+            path, fetched_at = self.path_for(url), None
+        try:
+            if fetched_at is None:
+                fetched_at = os.path.getmtime(path)
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0.0, None
+        with self._lock:
+            self._memory[url] = (fetched_at, data)
+        return fetched_at, data
+
+    def refresh_async(self, url):
+        with self._lock:
+            if url in self._in_flight:
+                return None
+            self._in_flight.add(url)
+        return self._executor.submit(self._refresh, url)
+
+    def _refresh(self, url):
+        try:
+            return self.fetch(url)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(url)
+
+    def fetch(self, url):
+        """Downloads an animation and stores it in memory and on disk."""
+        response = self.session.get(url, timeout=TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        self.store(url, data)
+        return data
+
+    def store(self, url, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._memory[url] = (time.time(), data)
+
+
+_cache = AnimationCache()
+
+
+def load_animation(url):
+    """Returns a Lottie animation without blocking: cached JSON, or `fallback_icon` while it downloads."""
+    return _cache.get(url)
+
+
+# --- Startup warmup ---
+_readiness = {"started": None, "finished": None, "results": []}
+
+
+def prefetch(urls=None, max_workers=8):
+    """Fetches animations concurrently into the cache and returns a readiness report.
+
+    Each entry has the animation's name, url, status ("cached", "fetched",
+    "stale" or "fallback") and, for the last two, the error from the refresh.
+    """
+    urls = list(urls or ANIMATIONS.values())
+    _readiness.update(started=time.time(), finished=None, results=[])
+
+    def warm(url):
+        result = {"name": _NAME_BY_URL.get(url, url), "url": url, "status": "cached", "error": None}
+        if _cache.is_cached(url):
+            return result
+        try:
+            _cache.fetch(url)
+            result["status"] = "fetched"
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # An expired copy is still served until a refresh succeeds
+            stale = _cache._lookup(url)[1] is not None
+            result.update(status="stale" if stale else "fallback", error=str(e))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lottie-warmup") as executor:
+        futures = [executor.submit(warm, url) for url in urls]
+        results = [future.result() for future in as_completed(futures)]
+    results.sort(key=lambda r: r["name"])
+    _readiness.update(finished=time.time(), results=results)
+    return results
+
+
+def prefetch_in_background():
+    """Starts `prefetch` on a daemon thread so the first page render never waits for it."""
+    thread = threading.Thread(target=prefetch, name="lottie-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness_report():
+    """Returns the last warmup's results, plus which animations are currently served as the fallback."""
+    return {
+        "started": _readiness["started"],
+        "finished": _readiness["finished"],
+        "results": _readiness["results"],
+        "fallbacks": [r["name"] for r in _readiness["results"] if r["status"] == "fallback"],
+    }
+
+
+def vendor(names=None):
+    """Downloads animations in ANIMATIONS, by name, into VENDOR_DIR so the app can run fully offline.
+
+    Returns one result per animation with its name, the path written (or
+    None) and the error if it couldn't be fetched; the rest are still written.
+    """
+    names = list(names or ANIMATIONS)
+    unknown = [name for name in names if name not in ANIMATIONS]
+    if unknown:
+        # Only registered animations are looked up in VENDOR_DIR, so anything else would never be read
+        raise ValueError(f"Not in ANIMATIONS: {', '.join(unknown)}")
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    results = []
+    for name in names:
+        url = ANIMATIONS[name]
+        result = {"name": name, "path": None, "error": None}
+        try:
+            data = _cache.fetch(url)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            result["error"] = str(e)
+        else:
+            result["path"] = _cache.vendored_path(url)
+            with open(result["path"], "w") as f:
+                json.dump(data, f)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch or vendor the app's Lottie animations.")
+    parser.add_argument("--vendor", action="store_true", help=f"write every animation into {VENDOR_DIR}/")
+    args = parser.parse_args()
+
+    if args.vendor:
+        for result in vendor():
+            print(f"wrote {result['path']}" if result["path"] else f"failed  {result['name']}  ({result['error']})")
+        return
+
+    for result in prefetch():
+        line = f"{result['status']:>8}  {result['name']}"
+        if result["error"]:
+            line += f"  ({result['error']})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
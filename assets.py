@@ -0,0 +1,319 @@
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+import streamlit as st
+
+from encoders import data_uri
+
+# --- Asset locations and server settings ---
+OPTIMIZED_DIR = "optimized"
+IMAGE_MANIFEST_PATH = os.path.join(OPTIMIZED_DIR, "manifest.json")
+ASSET_DIRS = ["images", "project_images", "resume", OPTIMIZED_DIR]
+ASSET_ROOT_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".mp4", ".webm", ".mp3", ".pdf")
+ASSET_HOST = os.environ.get("PORTFOLIO_ASSET_HOST", "0.0.0.0")
+ASSET_PORT = int(os.environ.get("PORTFOLIO_ASSET_PORT", "8765"))
+# The asset server only runs when the public URL browsers can reach it at is known; otherwise
+# assets are inlined, which works behind any proxy or port forward that only exposes Streamlit
+ASSET_BASE_URL = os.environ.get("PORTFOLIO_ASSET_BASE_URL", "").rstrip("/")
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+DIGEST_LENGTH = 16
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Returns the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def guess_mime(path):
+    mime, _ = mimetypes.guess_type(path)
+    return mime or "application/octet-stream"
+
+
+def normalize_path(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def parse_range(header, size):
+    """Parses a single `bytes=start-end` Range header.
+
+    Returns None when there is no usable range, "invalid" when it can't be
+    satisfied, or an inclusive (start, end) tuple.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return "invalid"
+    return start, min(end, size - 1)
+
+
+def copy_range(src, dst, length, chunk_size=64 * 1024):
+    while length > 0:
+        chunk = src.read(min(chunk_size, length))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+class Asset:
+    """A file on disk together with its content hash."""
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.path = normalize_path(path)
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.digest = hash_file(path)[:DIGEST_LENGTH]
+        self.mime = guess_mime(path)
+
+    @property
+    def url_path(self):
+        return f"/{self.digest}/{quote(os.path.basename(self.path))}"
+
+    def is_stale(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return stat.st_mtime_ns != self.mtime or stat.st_size != self.size
+
+
+class AssetRegistry:
+    """Maps file paths to content-hashed URLs and back."""
+
+    def __init__(self):
+        self._by_path = {}
+        self._by_digest = {}
+        self._lock = threading.Lock()
+        self.server = None
+
+    def scan(self, root="."):
+        """Hashes every asset under the known directories plus media files in the root."""
+        for directory in ASSET_DIRS:
+            full_dir = os.path.join(root, directory)
+            if not os.path.isdir(full_dir):
+                continue
+            for dirpath, _, filenames in os.walk(full_dir):
+                for filename in filenames:
+                    self.register(os.path.relpath(os.path.join(dirpath, filename), root))
+        for filename in os.listdir(root):
+            if filename.lower().endswith(ASSET_ROOT_EXTENSIONS) and os.path.isfile(os.path.join(root, filename)):
+                self.register(filename)
+        return self
+
+    def register(self, path):
+        asset = Asset(path)
+        with self._lock:
+            previous = self._by_path.get(asset.path)
+            if previous is not None and previous.digest != asset.digest:
+                self._by_digest.pop(previous.digest, None)
+            self._by_path[asset.path] = asset
+            self._by_digest[asset.digest] = asset
+        return asset
+
+    def get(self, path):
+        """Returns the asset for a path, re-hashing it if the file changed since the last scan."""
+        asset = self._by_path.get(normalize_path(path))
+        if asset is None or asset.is_stale():
+            asset = self.register(path)
+        return asset
+
+    def lookup_url(self, url_path):
+        """Finds an asset from a `/<digest>/<name>` request path."""
+        digest = url_path.split("?", 1)[0].lstrip("/").split("/", 1)[0]
+        return self._by_digest.get(digest)
+
+    def __len__(self):
+        return len(self._by_path)
+
+
+class AssetRequestHandler(BaseHTTPRequestHandler):
+    """Serves registered assets by content-hash URL with immutable cache headers."""
+
+    registry = None
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        asset = self.registry.lookup_url(self.path)
+        if asset is None or not os.path.exists(asset.path):
+            self.send_error(404, "Asset not found")
+            return
+
+        etag = f'"{asset.digest}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        byte_range = parse_range(self.headers.get("Range"), asset.size)
+        if byte_range == "invalid":
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{asset.size}")
+            self.end_headers()
+            return
+
+        start, end = byte_range or (0, asset.size - 1)
+        length = end - start + 1
+        self.send_response(206 if byte_range else 200)
+        self.send_header("Content-Type", asset.mime)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{asset.size}")
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            with open(asset.path, "rb") as f:
+                f.seek(start)
+                copy_range(f, self.wfile, length)
+
+    def _send_cache_headers(self, etag):
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", etag)
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_asset_server(registry, host=ASSET_HOST, port=ASSET_PORT):
+    """Starts the asset server on a daemon thread. Returns None if the port can't be bound."""
+    handler = type("BoundAssetRequestHandler", (AssetRequestHandler,), {"registry": registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError:
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="asset-server", daemon=True)
+    thread.start()
+    return server
+
+
+@st.cache_resource
+def get_asset_registry():
+    """Hashes all assets once per process and starts the asset server if PORTFOLIO_ASSET_BASE_URL is set."""
+    registry = AssetRegistry().scan()
+    if ASSET_BASE_URL:
+        registry.server = start_asset_server(registry)
+    return registry
+
+
+def asset_url(path):
+    """Returns a short content-hash URL for a file, or a data URI if the asset server isn't running."""
+    registry = get_asset_registry()
+    asset = registry.get(path)
+    if registry.server is not None:
+        return f"{ASSET_BASE_URL}{asset.url_path}"
+    return data_uri(asset.path, asset.mime)
+
+
+# --- Responsive image variants (built offline by optimize_images.py) ---
+_manifest = {"mtime": None, "data": {}}
+_manifest_lock = threading.Lock()
+
+
+def load_image_manifest():
+    """Returns the optimizer manifest, reloading it when the file changes."""
+    try:
+        mtime = os.stat(IMAGE_MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _manifest_lock:
+        if _manifest["mtime"] != mtime:
+            with open(IMAGE_MANIFEST_PATH) as f:
+                _manifest["data"] = json.load(f)
+            _manifest["mtime"] = mtime
+        return _manifest["data"]
+
+
+def image_variants(path, fmt="webp"):
+    """Returns the optimized variants of an image in one format, smallest first."""
+    entry = load_image_manifest().get(normalize_path(path))
+    if not entry:
+        return []
+    variants = [v for v in entry["variants"] if v["format"] == fmt and os.path.exists(v["path"])]
+    return sorted(variants, key=lambda v: v["width"])
+
+
+def best_image(path, display_width):
+    """Returns the smallest variant at least `display_width` wide, or the original if none were built."""
+    variants = image_variants(path)
+    if not variants:
+        return path
+    for variant in variants:
+        if variant["width"] >= display_width:
+            return variant["path"]
+    return variants[-1]["path"]
+
+
+def srcset(path, fmt="webp"):
+    return ", ".join(f"{asset_url(v['path'])} {v['width']}w" for v in image_variants(path, fmt))
+
+
+def picture_html(path, alt="", sizes="100vw", css_class="", style="width: 100%;"):
+    """Builds a <picture> element that lets the browser pick the smallest AVIF/WebP variant."""
+    fallback = best_image(path, 960)
+    img = f'<img src="{asset_url(fallback)}" alt="{alt}" loading="lazy" decoding="async" style="{style}">'
+    # Without the asset server every URL is a data URI, so only ship one variant
+    if get_asset_registry().server is None:
+        return f'<picture class="{css_class}">{img}</picture>'
+    sources = []
+    for fmt in ("avif", "webp"):
+        fmt_srcset = srcset(path, fmt)
+        if fmt_srcset:
+            sources.append(f'<source type="image/{fmt}" srcset="{fmt_srcset}" sizes="{sizes}">')
+    return f'<picture class="{css_class}">{"".join(sources)}{img}</picture>'
+
+
+def background_css(path, selector=".stApp"):
+    """Returns CSS that sets `selector`'s background to the smallest variant that covers the viewport."""
+    variants = image_variants(path)
+    avif = {v["width"]: v for v in image_variants(path, "avif")}
+    if not variants:
+        return f'{selector} {{ background-image: url("{asset_url(path)}"); }}'
+
+    # Without the asset server every URL is a data URI, so only ship one variant
+    if get_asset_registry().server is None:
+        return f'{selector} {{ background-image: url("{asset_url(best_image(path, 1920))}"); }}'
+
+    def rule(variant):
+        webp_url = asset_url(variant["path"])
+        declarations = f'background-image: url("{webp_url}");'
+        if variant["width"] in avif:
+            avif_url = asset_url(avif[variant["width"]]["path"])
+            declarations += (
+                f' background-image: image-set(url("{avif_url}") type("image/avif"),'
+                f' url("{webp_url}") type("image/webp"));'
+            )
+        return f"{selector} {{ {declarations} }}"
+
+    css = [rule(variants[-1])]
+    for variant in reversed(variants[:-1]):
+        css.append(f'@media (max-width: {variant["width"]}px) {{ {rule(variant)} }}')
+    return "\n".join(css)
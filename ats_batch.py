@@ -0,0 +1,127 @@
+"""Batch ATS scoring: a zip of resumes against several job descriptions.
+
+Resumes are extracted in parallel by `documents.extractor`. As they finish,
+they are scored in small batches against every JD at once with
+`ats_scoring.KeywordMatcher` (one sparse product per batch), so the ranked
+table can be redrawn while the rest are still being read. An optional LLM
+pass writes profile summaries for the top-k matches only, with bounded
+concurrency.
+"""
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from ats_scoring import KeywordMatcher
+
+MAX_RESUMES = 300
+MAX_TOTAL_BYTES = 200 * 1024 * 1024  # uncompressed, to refuse zip bombs
+SCORE_BATCH = 25  # resumes scored per sparse product
+REFRESH_SECONDS = 0.5  # minimum time between table updates
+SUMMARY_WORKERS = 3
+JD_SEPARATOR = re.compile(r"^\s*-{3,}\s*$", re.MULTILINE)
+RESERVED_COLUMNS = {"Resume", "Best JD", "Best match"}  # results_frame's own columns
+
+
+def read_resumes(zip_file, max_files=MAX_RESUMES, max_total_bytes=MAX_TOTAL_BYTES):
+    """Returns ([(name, bytes), ...], [skipped reasons]) for the PDFs in a zip upload."""
+    resumes, skipped, total, seen = [], [], 0, set()
+    with zipfile.ZipFile(zip_file) as archive:
+        for member in archive.infolist():
+            name = os.path.basename(member.filename)
+            if member.is_dir() or member.filename.startswith("__MACOSX/") or not name.lower().endswith(".pdf"):
+                continue
+            if len(resumes) == max_files:
+                skipped.append(f"Only the first {max_files} resumes were scored.")
+                break
+            if total + member.file_size > max_total_bytes:
+                skipped.append(f"Stopped at {max_total_bytes // (1024 * 1024)} MB of resumes.")
+                break
+            total += member.file_size
+            # Names key the results, so resumes with the same file name in different folders stay apart
+            unique, n = name, 2
+            while unique in seen:
+                unique, n = f"{name} ({n})", n + 1
+            seen.add(unique)
+            resumes.append((unique, archive.read(member)))
+    return resumes, skipped
+
+
+def split_job_descriptions(text):
+    """Splits pasted JDs on lines of `---`; each JD is titled by its first line."""
+    jds, seen = [], set(RESERVED_COLUMNS)
+    for part in JD_SEPARATOR.split(text):
+        part = part.strip()
+        if part:
+            title = part.splitlines()[0].strip()[:40]
+            # Titles become column names, so keep them apart from each other and from the fixed columns
+            unique, n = title, 2
+            while unique in seen:
+                unique, n = f"{title} ({n})", n + 1
+            seen.add(unique)
+            jds.append((unique, part))
+    return jds
+
+
+def results_frame(names, scores, titles):
+    """Resume x JD match table, best match first."""
+    scores = np.asarray(scores, dtype=np.float64)  # float32 scores round to 83.300003 on display
+    frame = pd.DataFrame(scores.round(1) if len(names) else None, columns=titles)
+    frame.insert(0, "Resume", names)
+    if len(names):
+        frame["Best JD"] = [titles[i] for i in scores.argmax(axis=1)]
+        frame["Best match"] = scores.max(axis=1).round(1)
+    else:
+        frame["Best JD"], frame["Best match"] = [], []
+    return frame.sort_values("Best match", ascending=False, ignore_index=True)
+
+
+def score_resumes(named_files, jds, extractor):
+    """Yields (done, total, frame, texts, errors) as resumes are extracted and scored.
+
+    `texts` maps resume names to extracted text; `errors` maps names to the
+    reason they couldn't be read.
+    """
+    matcher = KeywordMatcher([jd for _, jd in jds])
+    titles = [title for title, _ in jds]
+    total = len(named_files)
+    names, blocks, texts, errors = [], [], {}, {}
+    pending = []
+    last_refresh = 0.0
+
+    def flush():
+        if pending:
+            blocks.append(matcher.scores([texts[name] for name in pending]))
+            names.extend(pending)
+            pending.clear()
+        scores = np.vstack(blocks) if blocks else np.zeros((0, len(titles)))
+        return results_frame(names, scores, titles)
+
+    for done, (name, document) in enumerate(extractor.extract_many(named_files), start=1):
+        if isinstance(document, Exception):
+            errors[name] = str(document)
+        else:
+            texts[name] = document.text
+            pending.append(name)
+        if len(pending) >= SCORE_BATCH or time.monotonic() - last_refresh > REFRESH_SECONDS:
+            last_refresh = time.monotonic()
+            yield done, total, flush(), texts, errors
+    yield total, total, flush(), texts, errors
+
+
+def summarize_top(frame, texts, jds, k, summarize, max_workers=SUMMARY_WORKERS):
+    """Yields (resume name, summary or error) for the top-k rows, running `summarize(text, jd)` concurrently."""
+    jd_by_title = dict(jds)
+    top = frame.head(k)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ats-summary") as executor:
+        futures = {executor.submit(summarize, texts[row["Resume"]], jd_by_title[row["Best JD"]]): row["Resume"]
+                   for _, row in top.iterrows()}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], f"Error: {e}"
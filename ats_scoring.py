@@ -0,0 +1,115 @@
+"""Local resume-vs-job-description keyword scoring.
+
+Computes the ATS bot's "JD Match" and "MissingKeywords" in milliseconds,
+without an LLM call. Text is cut into phrases at punctuation and stop words.
+The keywords are the words and adjacent word pairs inside those phrases, so
+"machine learning" is a keyword but "sql machine" isn't. Each JD's most
+frequent keywords are weighted by log term frequency. A resume's match is
+the share of that weight whose keywords appear in the resume. Everything
+runs on sparse scikit-learn/SciPy matrices, so scoring many resumes against
+many JDs is a single sparse product.
+"""
+import re
+
+import numpy as np
+
+from lazy import lazy_import
+
+sparse = lazy_import("scipy.sparse")
+text = lazy_import("sklearn.feature_extraction.text")
+
+MAX_KEYWORDS = 40  # per JD
+SHOWN_MISSING = 15
+PHRASE_BREAK = re.compile(r"[,;:!?()\[\]{}\"'|/\\\n\r\t•·–—]|\.(?=\s|$)")
+TOKEN = re.compile(r"[a-z][a-z0-9]*(?:\+\+|#|\.[a-z]+)?")
+SHORT_TERMS = {"c", "r"}  # single letters worth keeping
+
+JD_BOILERPLATE = {
+    "ability", "able", "candidate", "company", "environment", "excellent", "experience", "good", "great",
+    "including", "job", "join", "knowledge", "looking", "new", "plus", "preferred", "required",
+    "requirements", "responsibilities", "role", "skills", "strong", "team", "understanding", "using",
+    "work", "working", "year", "years", "etc", "like", "must", "well", "within", "across", "build",
+    "you", "will", "we", "our", "ideal", "opportunity",
+}
+
+
+def keywords(document):
+    """Words and adjacent word pairs within each phrase of `document`, lowercased."""
+    stop_words = text.ENGLISH_STOP_WORDS | JD_BOILERPLATE
+    terms = []
+    for chunk in PHRASE_BREAK.split(document.lower()):
+        run = []
+        for token in TOKEN.findall(chunk) + [None]:
+            if token is None or token in stop_words or (len(token) == 1 and token not in SHORT_TERMS):
+                terms.extend(run)
+                terms.extend(f"{a} {b}" for a, b in zip(run, run[1:]))
+                run = []
+            else:
+                run.append(token)
+    return terms
+
+
+def has_keywords(job_description):
+    """False for JDs with nothing to match on, e.g. only boilerplate or a non-Latin script."""
+    return bool(keywords(job_description))
+
+
+class KeywordMatcher:
+    """Keyword weights for a set of JDs, and match scores of resumes against them."""
+
+    def __init__(self, job_descriptions, max_keywords=MAX_KEYWORDS):
+        self.vectorizer = text.CountVectorizer(analyzer=keywords)
+        try:
+            counts = self.vectorizer.fit_transform(job_descriptions).tocsr().astype(np.float32)
+        except ValueError:
+            # Empty vocabulary: no JD has any keywords, so every match is 0%
+            self.vectorizer = None
+            self.terms = np.array([], dtype=object)
+            self.weights = sparse.csr_matrix((len(job_descriptions), 0), dtype=np.float32)
+            return
+        counts.data = np.log1p(counts.data)
+        self.terms = self.vectorizer.get_feature_names_out()
+        self.weights = self._top_k(counts, max_keywords)  # (n_jds, vocab) sparse
+
+    @staticmethod
+    def _top_k(weights, k):
+        """Keeps only each row's k largest weights."""
+        weights = weights.tolil()
+        for i, (columns, values) in enumerate(zip(weights.rows, weights.data)):
+            if len(values) > k:
+                keep = np.argsort(values)[::-1][:k]
+                weights.rows[i] = [columns[j] for j in sorted(keep)]
+                weights.data[i] = [values[j] for j in sorted(keep)]
+        return weights.tocsr()
+
+    def presence(self, resumes):
+        """Binary (n_resumes, vocab) sparse matrix of which JD keywords each resume contains."""
+        if self.vectorizer is None:
+            return sparse.csr_matrix((len(resumes), 0), dtype=np.float32)
+        present = self.vectorizer.transform(resumes).tocsr()
+        present.data[:] = 1
+        return present.astype(np.float32)
+
+    def scores(self, resumes):
+        """(n_resumes, n_jds) array of match percentages."""
+        totals = np.asarray(self.weights.sum(axis=1)).ravel()
+        covered = (self.presence(resumes) @ self.weights.T).toarray()
+        return 100 * covered / np.where(totals == 0, 1, totals)
+
+    def missing_keywords(self, resume, jd_index=0, limit=SHOWN_MISSING):
+        """The JD's heaviest keywords that the resume lacks, most important first."""
+        row = self.weights.getrow(jd_index)
+        present = set(self.presence([resume]).indices)
+        missing = [(weight, column) for column, weight in zip(row.indices, row.data) if column not in present]
+        missing.sort(reverse=True)
+        terms = [self.terms[column] for _, column in missing]
+        # A missing phrase already says its words are missing
+        in_phrases = {word for term in terms if " " in term for word in term.split()}
+        return [term for term in terms if " " in term or term not in in_phrases][:limit]
+
+
+def score_resume(resume, job_description):
+    """Returns {"JD Match": "NN%", "MissingKeywords": [...]} for one resume and one JD."""
+    matcher = KeywordMatcher([job_description])
+    match = float(matcher.scores([resume])[0, 0])
+    return {"JD Match": f"{match:.0f}%", "MissingKeywords": matcher.missing_keywords(resume)}
@@ -0,0 +1,87 @@
+"""Split long recordings into segments at silences, without decoding the whole file.
+
+Cut points are planned every `segment_seconds`. Around each target, ffmpeg
+decodes a short low-rate window, and pydub finds the longest silence in it to
+cut on. Memory use depends on the window size, not on the recording's length.
+"""
+import os
+import re
+import shutil
+import subprocess
+
+from lazy import lazy_import
+
+pydub = lazy_import("pydub")
+silence = lazy_import("pydub.silence")
+
+FFMPEG = os.environ.get("FFMPEG", "ffmpeg")
+SEGMENT_SECONDS = 10 * 60
+SEARCH_SECONDS = 30  # how far either side of a target cut point to look for silence
+ANALYSIS_RATE = 8000  # Hz; plenty for finding pauses in speech
+MIN_SILENCE_MS = 400
+SILENCE_THRESH_DB = -40
+SEEK_STEP_MS = 10  # pydub's default of 1 ms makes detect_silence ~10x slower for no useful precision
+
+DURATION_LINE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def ffmpeg_available():
+    """True if the ffmpeg binary (`FFMPEG`) can be found."""
+    return shutil.which(FFMPEG) is not None
+
+
+def media_duration(file_path):
+    """Length of a media file in seconds, as reported by ffmpeg."""
+    result = subprocess.run([FFMPEG, "-nostdin", "-hide_banner", "-i", file_path],
+                            capture_output=True, text=True)
+    match = DURATION_LINE.search(result.stderr)
+    if not match:
+        raise ValueError(f"Couldn't read the duration of {os.path.basename(file_path)}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def load_window(file_path, start, duration):
+    """Decodes `duration` seconds from `start` as a mono 8 kHz pydub AudioSegment."""
+    result = subprocess.run(
+        [FFMPEG, "-nostdin", "-loglevel", "error", "-ss", f"{start:.3f}", "-i", file_path,
+         "-t", f"{duration:.3f}", "-vn", "-ac", "1", "-ar", str(ANALYSIS_RATE), "-f", "s16le", "pipe:1"],
+        capture_output=True, check=True,
+    )
+    return pydub.AudioSegment(data=result.stdout, sample_width=2, frame_rate=ANALYSIS_RATE, channels=1)
+
+
+def find_cut(file_path, target, search_seconds=SEARCH_SECONDS):
+    """Returns the time (s) of the middle of the longest silence near `target`, or `target` if there's none."""
+    start = max(target - search_seconds, 0.0)
+    window = load_window(file_path, start, 2 * search_seconds)
+    gaps = silence.detect_silence(window, min_silence_len=MIN_SILENCE_MS, silence_thresh=SILENCE_THRESH_DB,
+                                  seek_step=SEEK_STEP_MS)
+    if not gaps:
+        return target
+    gap_start, gap_end = max(gaps, key=lambda gap: (gap[1] - gap[0], -abs(start + gap[0] / 1000 - target)))
+    return start + (gap_start + gap_end) / 2000
+
+
+def plan_segments(file_path, segment_seconds=SEGMENT_SECONDS, duration=None):
+    """Returns [(start, end), ...] in seconds covering the whole file, cut at silences.
+
+    Recordings shorter than 1.5 segments come back as a single segment.
+    `segment_seconds` must be more than twice `SEARCH_SECONDS`, so that each
+    silence search starts after the previous cut.
+    """
+    if segment_seconds <= 2 * SEARCH_SECONDS:
+        raise ValueError(f"segment_seconds must be more than {2 * SEARCH_SECONDS}, got {segment_seconds}")
+    duration = duration if duration is not None else media_duration(file_path)
+    if duration < 1.5 * segment_seconds:
+        return [(0.0, duration)]
+    cuts = [0.0]
+    target = segment_seconds
+    while duration - target > segment_seconds / 2:
+        cut = find_cut(file_path, target)
+        if not cuts[-1] < cut < duration:
+            cut = target  # never an empty or backwards segment
+        cuts.append(cut)
+        target = cut + segment_seconds
+    cuts.append(duration)
+    return list(zip(cuts, cuts[1:]))
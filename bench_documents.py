@@ -0,0 +1,74 @@
+"""Benchmark for resume PDF extraction on long documents.
+
+Generates synthetic PDFs of a few hundred pages with fpdf, then times:
+- the old extractor (pages read one by one, appended with `text +=`);
+- the new extractor (worker processes, one join), cold and warm;
+- a repeat extraction of the same file, answered from the hash cache.
+
+Usage:
+    python bench_documents.py [--pages 100 300 600] [--workers 4]
+"""
+import argparse
+import io
+import random
+import time
+
+import fpdf
+import PyPDF2
+
+from documents import DocumentExtractor
+
+WORDS = ("python sql pandas spark airflow docker kubernetes tableau statistics regression "
+         "forecasting dashboard pipeline warehouse modelling stakeholder analysis machine learning").split()
+
+
+def synthetic_pdf(pages, lines_per_page=40, seed=0):
+    """A `pages`-page PDF of random resume-ish text, as bytes."""
+    rng = random.Random(seed)
+    document = fpdf.FPDF()
+    document.set_font("Arial", size=10)
+    for _ in range(pages):
+        document.add_page()
+        for _ in range(lines_per_page):
+            document.cell(0, 6, " ".join(rng.choice(WORDS) for _ in range(12)), ln=1)
+    return document.output(dest="S").encode("latin1")
+
+
+def old_extract(data):
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in range(len(reader.pages)):
+        page = reader.pages[page]
+        text += str(page.extract_text())
+    return text
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and parallel PDF text extraction.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 300, 600])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    extractor = DocumentExtractor(workers=args.workers, max_pages=None, max_bytes=1 << 30)
+    # Start the worker processes so the first row doesn't pay for spawning them
+    extractor.extract(synthetic_pdf(extractor.workers * 8, seed=-1))
+
+    print(f"{'pages':>6} {'MB':>6} {'old s':>7} {'new s':>7} {'speedup':>8} {'cached ms':>10} {'same text':>10}")
+    for pages in args.pages:
+        data = synthetic_pdf(pages)
+        old_time, old_text = timed(old_extract, data)
+        new_time, document = timed(extractor.extract, data)
+        cached_time, _ = timed(extractor.extract, data)
+        same = "".join(old_text.split()) == "".join(document.text.split())
+        print(f"{pages:>6} {len(data) / 1e6:>6.1f} {old_time:>7.2f} {new_time:>7.2f} {old_time / new_time:>8.1f} "
+              f"{cached_time * 1000:>10.1f} {'yes' if same else 'NO':>10}")
+
+
+if __name__ == "__main__":
+    main()
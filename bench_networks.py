@@ -0,0 +1,94 @@
+"""Benchmark for the network page at 100, 1k and 10k nodes.
+
+For each size it builds a synthetic skill/project/repo/dependency graph and
+reports, for both the raw graph and the aggregated view the app actually
+renders: server-side build time (index + layout + HTML), HTML size, and
+time-to-interactive. TTI is measured in headless Chromium (time until the
+vis.js network has drawn) when Playwright is installed, and reported as n/a
+otherwise.
+
+Usage:
+    python bench_networks.py [--sizes 100 1000 10000] [--groups 12]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from graph_registry import Graph
+from networks import MAX_RENDERED_NODES, STATIC_NETWORK_OPTIONS, build_network_html
+
+GROUP_KINDS = ["Skill", "Project", "Repo", "Dependency"]
+
+
+def synthetic_graph(n, groups, seed=0):
+    """Random graph with ~2 edges per node, biased towards edges inside a group."""
+    rng = np.random.default_rng(seed)
+    group_names = [f"{GROUP_KINDS[i % len(GROUP_KINDS)]} {i // len(GROUP_KINDS) + 1}" for i in range(groups)]
+    node_groups = rng.integers(0, groups, n)
+    nodes = [{"id": f"n{i}", "group": group_names[g]} for i, g in enumerate(node_groups)]
+    members = [np.flatnonzero(node_groups == g) for g in range(groups)]
+    edges = []
+    for i in range(n):
+        for _ in range(2):
+            same_group = rng.random() < 0.8
+            j = int(rng.choice(members[node_groups[i]])) if same_group else int(rng.integers(0, n))
+            if i != j:
+                edges.append({"source": f"n{i}", "target": f"n{j}", "label": "uses"})
+    return Graph(nodes, edges, heading=f"Synthetic {n}")
+
+
+def measure_tti(html, browser):
+    """Seconds from navigation until vis.js has drawn the network once."""
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False) as f:
+        f.write(html)
+        path = f.name
+    try:
+        page = browser.new_page()
+        start = time.perf_counter()
+        page.goto(f"file://{path}")
+        page.wait_for_function("typeof network !== 'undefined' && network.body !== undefined", timeout=120000)
+        page.evaluate("new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
+        elapsed = time.perf_counter() - start
+        page.close()
+        return elapsed
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark network rendering at increasing graph sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--groups", type=int, default=12)
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch()
+    except Exception:
+        playwright = browser = None
+        print("Playwright/Chromium not available: time-to-interactive will be reported as n/a\n")
+
+    print(f"{'nodes':>7} {'view':>10} {'rendered':>9} {'build s':>8} {'HTML KB':>9} {'TTI s':>7}")
+    for n in args.sizes:
+        start = time.perf_counter()
+        graph = synthetic_graph(n, args.groups)
+        index_time = time.perf_counter() - start
+        views = [("raw", graph), ("aggregated", graph.aggregate(MAX_RENDERED_NODES))]
+        for name, view in views:
+            start = time.perf_counter()
+            html = build_network_html(view, STATIC_NETWORK_OPTIONS)
+            build_time = time.perf_counter() - start + (index_time if name == "raw" else 0.0)
+            tti = f"{measure_tti(html, browser):7.2f}" if browser else f"{'n/a':>7}"
+            print(f"{n:>7} {name:>10} {len(view):>9} {build_time:>8.2f} {len(html.encode()) / 1024:>9.0f} {tti}")
+
+    if browser:
+        browser.close()
+        playwright.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark for single-job vs segmented parallel transcription.
+
+Generates a synthetic recording (a tone broken by a short pause every 20 s,
+standing in for speech), then transcribes it through the JobEngine against
+the local mock AssemblyAI server. The mock charges a configurable processing
+time per audio minute, so the run shows how much parallel segments cut the
+wall-clock time. Requires ffmpeg (or FFMPEG=/path/to/ffmpeg).
+
+Usage:
+    python bench_transcription.py [--minutes 120] [--segment-minutes 10]
+        [--workers 1 4 8] [--seconds-per-audio-minute 0.5]
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from audio_segments import FFMPEG
+from mock_assemblyai import start_mock_server
+from transcription_jobs import AssemblyAIClient, JobEngine
+
+MP3_BYTES_PER_MINUTE = 64000 // 8 * 60  # the engine uploads 64 kbps MP3
+
+
+def synthetic_recording(minutes, path):
+    """Writes `minutes` of mono 16 kHz MP3: 18 s of tone, then 2 s of silence, repeated."""
+    subprocess.run(
+        [FFMPEG, "-y", "-nostdin", "-loglevel", "error", "-f", "lavfi",
+         "-i", "aevalsrc='0.5*sin(440*2*PI*t)*lt(mod(t,20),18)':s=16000",
+         "-t", str(minutes * 60), "-ac", "1", "-b:a", "64k", path],
+        check=True,
+    )
+
+
+def run(engine, path, parallel):
+    """Transcribes `path` and returns (seconds, job)."""
+    start = time.perf_counter()
+    job = engine.submit(path, cleanup=False, parallel=parallel)
+    while not job.done:
+        time.sleep(0.05)
+    return time.perf_counter() - start, job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-job and segmented parallel transcription.")
+    parser.add_argument("--minutes", type=float, default=120)
+    parser.add_argument("--segment-minutes", type=float, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="segment concurrency levels")
+    parser.add_argument("--seconds-per-audio-minute", type=float, default=0.5,
+                        help="simulated processing time the mock charges per minute of audio")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(queue_seconds=0.2, base_seconds=0.5,
+                                         seconds_per_audio_minute=args.seconds_per_audio_minute,
+                                         bytes_per_minute=MP3_BYTES_PER_MINUTE)
+    client = AssemblyAIClient("mock-key", base_url=base_url)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recording.mp3")
+        synthetic_recording(args.minutes, path)
+        print(f"{args.minutes:g} min recording, {os.path.getsize(path) / 1e6:.1f} MB, "
+              f"mock charges {args.seconds_per_audio_minute:g} s per audio minute\n")
+        print(f"{'mode':>16} {'segments':>9} {'wall s':>8} {'speedup':>8} {'words':>7} {'in order':>9}")
+
+        # Fresh engines so no run reuses another's cached uploads
+        baseline, job = run(JobEngine(client), path, parallel=False)
+        print(f"{'single job':>16} {1:>9} {baseline:>8.1f} {1.0:>8.1f} {len(job.words or []):>7} {'yes':>9}")
+        for workers in args.workers:
+            engine = JobEngine(client, segment_workers=workers, segment_seconds=args.segment_minutes * 60)
+            elapsed, job = run(engine, path, parallel=True)
+            starts = [word["start"] for word in job.words or []]
+            ordered = "yes" if starts == sorted(starts) else "NO"
+            print(f"{f'{workers} workers':>16} {len(job.segments):>9} {elapsed:>8.1f} "
+                  f"{baseline / elapsed:>8.1f} {len(starts):>7} {ordered:>9}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bounded chat history for long sessions.
+
+Each bot keeps its recent messages in a ring buffer (`MAX_MESSAGES`). Messages
+that fall out of the buffer are folded, a batch at a time, into a rolling
+summary. The summary and the last few turns then stand in for the full
+transcript, both in the prompt sent to Gemini and on screen. That keeps
+per-rerun rendering and prompt size constant however long the conversation
+runs.
+"""
+from collections import deque
+
+MAX_MESSAGES = 40  # messages kept verbatim per bot
+VISIBLE_MESSAGES = 10  # messages drawn on each rerun until "show earlier" is clicked
+CONTEXT_MESSAGES = 6  # recent messages included in the prompt
+SUMMARIZE_BATCH = 10  # evicted messages folded into the summary at a time
+MAX_SUMMARY_CHARS = 2000
+
+
+class ChatHistory:
+    """Ring buffer of recent messages plus a rolling summary of everything older."""
+
+    def __init__(self, max_messages=MAX_MESSAGES, summarize_batch=SUMMARIZE_BATCH):
+        self.messages = deque(maxlen=max_messages)
+        self.summarize_batch = summarize_batch
+        self.summary = ""
+        self.pending = []  # evicted but not yet summarized
+        self.total = 0
+        self.visible = VISIBLE_MESSAGES
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def append(self, message):
+        if len(self.messages) == self.messages.maxlen:
+            self.pending.append(self.messages[0])
+        self.messages.append(message)
+        self.total += 1
+
+    def tail(self, n):
+        """The last `n` messages, oldest first."""
+        start = max(len(self.messages) - n, 0)
+        return [self.messages[i] for i in range(start, len(self.messages))]
+
+    @property
+    def hidden_count(self):
+        """Messages not drawn: older buffered ones beyond `visible`, plus everything summarized."""
+        return self.total - min(self.visible, len(self.messages))
+
+    @property
+    def needs_summary(self):
+        return len(self.pending) >= self.summarize_batch
+
+    def summarize(self, summarizer):
+        """Folds pending messages into the summary with `summarizer(summary, messages) -> str`.
+
+        If the summarizer fails, the first sentence of each message is
+        appended instead, so the summary still covers every turn.
+        """
+        if not self.pending:
+            return
+        try:
+            summary = summarizer(self.summary, self.pending)
+        except Exception:
+            gist = " ".join(f"{m['role']}: {m['content'].split('. ')[0][:200]}" for m in self.pending)
+            summary = f"{self.summary} {gist}".strip()
+        self.summary = summary[-MAX_SUMMARY_CHARS:]
+        self.pending = []
+
+    def context(self, recent=CONTEXT_MESSAGES):
+        """The conversation so far as prompt text: the rolling summary plus the last `recent` messages."""
+        parts = []
+        older = self.summary
+        if self.pending:
+            older = f"{older} " + " ".join(f"{m['role']}: {m['content'][:200]}" for m in self.pending)
+        if older.strip():
+            parts.append(f"Summary of the earlier conversation:\n{older.strip()}")
+        recent_messages = self.tail(recent)
+        if recent_messages:
+            parts.append("Recent messages:\n" + "\n".join(f"{m['role']}: {m['content']}" for m in recent_messages))
+        return "\n\n".join(parts)
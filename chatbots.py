@@ -1,41 +1,93 @@
 import streamlit as st
 import yaml
-import google.generativeai as genai
-from pydub import AudioSegment
 import uuid
 from utils import load_lottieurl, display_lottie
+from animations import ANIMATIONS
+import ats_batch
+import ats_scoring
+import documents
+import gemini_clients
+import llm_cache
+import llm_scheduler
+import structured_output
+import transcript_pdf
+import transcript_store
+from chat_history import ChatHistory, VISIBLE_MESSAGES
+import transcription_jobs
 from streamlit_option_menu import option_menu
 from streamlit_lottie import st_lottie
 import json
-from fpdf import FPDF
+import functools
+import os
 import time
-import PyPDF2 as pdf
 import re
-import tempfile
-import requests
+import zipfile
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
 
-# Access configuration values
-ASSEMBLY_AI_API_KEY = config['assemblyai_api_key']
-GEMINI_AI_API_KEY = config['gemini_api_key']
-# ...
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """Reads config.yaml once, on first use rather than at import."""
+    with open('config.yaml', 'r') as f:
+        return yaml.safe_load(f)
 
-@st.cache_data
-def generate_response(prompt, model_name="gemini-1.5-flash"):
-    """Generates a response from a specified Gemini model."""
-    genai.configure(api_key=GEMINI_AI_API_KEY)
-    model = genai.GenerativeModel(model_name)
-    response = model.generate_content(prompt)
-    return response.text
+# Configured once per process; every bot's calls share its models and connections
+gemini = gemini_clients.GeminiRegistry(lambda: get_config()['gemini_api_key'], scheduler=llm_scheduler.Scheduler())
+
+@st.cache_resource
+def get_llm_cache():
+    """Response cache shared by every session, persisted in SQLite."""
+    return llm_cache.LLMCache()
 
 # --- Helper Functions ---
-def display_chat_history(messages):
-    for message in messages:
+def get_history(key):
+    """Returns the bot's bounded ChatHistory from the session, creating it on first use."""
+    history = st.session_state.get(key)
+    if not isinstance(history, ChatHistory):
+        history = st.session_state[key] = ChatHistory()
+    return history
+
+def display_chat_history(history, key):
+    """Draws only the most recent messages; older ones are a click (or the summary) away."""
+    if history.summary:
+        with st.expander("Earlier in this conversation"):
+            st.markdown(history.summary)
+    if history.hidden_count and history.visible < len(history):
+        if st.button("Show earlier messages", key=f"{key}_show_earlier"):
+            history.visible += VISIBLE_MESSAGES
+    for message in history.tail(history.visible):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
+def with_context(history, prompt):
+    """Prefixes the prompt with the rolling summary and recent turns, instead of the full transcript."""
+    context = history.context()
+    return f"{context}\n\n{prompt}" if context else prompt
+
+def turn_prompt(history, user_input, prompt):
+    """Returns (prompt with context, similarity query) for a new user turn.
+
+    Similar-question lookup only makes sense without earlier turns to depend on.
+    """
+    query = user_input if not history.total else None
+    return with_context(history, prompt), query
+
+summary_prompt = """
+Update the running summary of a chat conversation with the new messages below.
+Keep names, facts, decisions and open questions; drop small talk. Reply with the
+updated summary only, in under 150 words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+"""
+
+def summarize_turns(summary, messages):
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    return gemini.generate(summary_prompt.format(summary=summary or "(none)", messages=transcript),
+                           bot="history_summary")
+
 def get_user_input(prompt="Your message:"):
     return st.chat_input(prompt)
 
@@ -49,48 +101,75 @@ def add_assistant_message(messages, response_text):
     with st.chat_message("assistant"):
         st.markdown(response_text)
 
+def write_stream(chunks):
+    """Renders text chunks as they arrive and returns the full text."""
+    if hasattr(st, "write_stream"):
+        return st.write_stream(chunks)
+    placeholder = st.empty()
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text)
+    return text
+
+def stream_assistant_message(messages, prompt, bot, query=None):
+    """Streams Gemini's reply into an assistant bubble, then saves the full text to the history.
+
+    Cached answers are shown at once without calling Gemini.
+    """
+    cache = get_llm_cache()
+    model_name = gemini_clients.DEFAULT_MODEL
+    with st.chat_message("assistant"):
+        response_text = cache.get(bot, model_name, prompt, query=query)
+        if response_text is not None:
+            st.markdown(response_text)
+        else:
+            try:
+                response_text = write_stream(gemini.stream(prompt, model_name=model_name, bot=bot))
+            except Exception as e:
+                st.error(f"An error occurred: {e}")
+                return None
+            cache.put(bot, model_name, prompt, response_text, query=query)
+    messages.append({"role": "assistant", "content": response_text})
+    if getattr(messages, "needs_summary", False):
+        messages.summarize(summarize_turns)
+    return response_text
+
 # **1. Thesis Writer Assistant**
 def thesis_writer_assistant():
     st.header("Thesis Writer Assistant")
 
     # Use a unique key for session state to avoid conflicts with other bots
-    messages = st.session_state.setdefault("thesis_messages", []) 
+    history = get_history("thesis_messages")
     
     # Display the existing chat history
-    display_chat_history(messages)
+    display_chat_history(history, "thesis")
 
     # Get user input
     user_input = get_user_input("Describe your thesis topic or ask for assistance:")
 
     # Process user input
     if user_input:
-        add_user_message(messages, user_input)
-
-        # Generate AI response (Example - adjust based on user input)
-        prompt = f"""Provide assistance for a thesis on: '{user_input}'."""
-        response_text = generate_response(prompt)  
-
-        add_assistant_message(messages, response_text)
+        prompt, query = turn_prompt(history, user_input, f"""Provide assistance for a thesis on: '{user_input}'.""")
+        add_user_message(history, user_input)
+        stream_assistant_message(history, prompt, bot="thesis", query=query)
 
 def input_pdf_text(uploaded_file):
-    reader = pdf.PdfReader(uploaded_file)
-    text = ""
-    for page in range(len(reader.pages)):
-        page = reader.pages[page]
-        text += str(page.extract_text())
-    return text
-
-# Prompt Template for ATS Bot (More explicit JSON formatting)
+    """Resume text, extracted in parallel and cached by file hash; warns if pages were skipped."""
+    document = documents.extractor.extract(uploaded_file)
+    if document.truncated:
+        st.warning(f"Only the first {len(document.pages)} of {document.page_count} pages were analysed.")
+    return document.text
+
+# Prompt Template for ATS Bot. JD Match and MissingKeywords are computed locally
+# (ats_scoring), so Gemini is only asked for the part that needs a language model.
 input_prompt = """
 You are a skilled and experienced ATS (Application Tracking System) with a deep understanding 
 of tech fields like software engineering, data science, data analysis, and big data engineering.
 
-Your task is to evaluate the provided resume against the given job description. 
-Consider the competitive job market and offer the best assistance for improving the resume. 
-
-Assign a "JD Match" percentage based on how well the resume matches the job description and 
-identify "MissingKeywords" that are present in the job description but not in the resume.
-Also, provide a "Profile Summary" of the candidate's skills based on the resume. 
+Your task is to write a "Profile Summary" of the candidate's skills based on the resume, 
+judged against the given job description. Consider the competitive job market and mention 
+the most useful improvements to the resume. 
 
 Resume:
 {text}
@@ -99,34 +178,120 @@ Job Description:
 {jd}
 
 I want the response ONLY in valid JSON format with the following structure:
-{{"JD Match":"%", "MissingKeywords":["keyword1", "keyword2", ...], "Profile Summary":"..."}}
+{{"Profile Summary":"..."}}
 """
 
 def resume_ats_score_bot():
     st.header("Resume ATS Score Bot")
+    if st.radio("Mode", ["Single resume", "Batch (zip of resumes)"], horizontal=True) != "Single resume":
+        ats_batch_mode()
+        return
     jd = st.text_area("Paste the Job Description")
     uploaded_file = st.file_uploader("Upload Your Resume", type="pdf")
+    fast_mode = st.checkbox("Fast mode (keyword scoring only, no AI profile summary)")
 
     if st.button("Analyze Resume"):
         if uploaded_file and jd:
-            text = input_pdf_text(uploaded_file)
-            final_prompt = input_prompt.format(text=text, jd=jd)
-            response = generate_response(final_prompt)
-
             try:
-                # Directly parse the JSON response
-                response_json = json.loads(response) 
-
-                st.subheader("ATS Analysis:")
-                st.write(f"**JD Match:** {response_json.get('JD Match', 'N/A')}")
-                st.write(f"**Missing Keywords:** {', '.join(response_json.get('MissingKeywords', []))}")
-                st.write(f"**Profile Summary:** {response_json.get('Profile Summary', 'N/A')}")
-
-            except json.JSONDecodeError:
-                st.error("Error: Invalid JSON response. Please check the prompt and API response.")
+                text = input_pdf_text(uploaded_file)
+            except (documents.DocumentTooLarge, documents.DocumentUnreadable) as e:
+                st.error(str(e))
+                return
+
+            # Scored locally in milliseconds, shown before any API call
+            if not ats_scoring.has_keywords(jd):
+                st.warning("The job description has no English keywords to match on, so the JD Match is 0%.")
+            scores = ats_scoring.score_resume(text, jd)
+            st.subheader("ATS Analysis:")
+            st.write(f"**JD Match:** {scores['JD Match']}")
+            st.write(f"**Missing Keywords:** {', '.join(scores['MissingKeywords']) or 'None'}")
+
+            if fast_mode:
+                return
+            with st.spinner("Writing profile summary..."):
+                summary = profile_summary(text, jd)
+            if summary is not None:
+                st.write(f"**Profile Summary:** {summary}")
+            else:
+                st.error("Error: Gemini didn't return a usable profile summary. Please try again.")
         else:
             st.warning("Please upload a resume and provide a job description.")
 
+PROFILE_SCHEMA = structured_output.Schema([
+    structured_output.Field("Profile Summary", str, "A short summary of the candidate against the job description."),
+])
+JSON_REPLY = {"response_mime_type": "application/json"}
+
+def profile_summary(text, jd, cache=None):
+    """Asks Gemini for the candidate's profile summary; None if no valid one could be read.
+
+    Only validated values are cached, so a malformed reply isn't served
+    again on the next click.
+    """
+    cache = cache or get_llm_cache()
+    prompt = input_prompt.format(text=text, jd=jd)
+    values, problems = PROFILE_SCHEMA.read(cache.get("ats", gemini_clients.DEFAULT_MODEL, prompt))
+    if problems:
+        try:
+            values = structured_output.ask(
+                lambda p: gemini.generate(p, bot="ats", generation_config=JSON_REPLY), prompt, PROFILE_SCHEMA)
+        except structured_output.StructuredOutputError:
+            return None
+        cache.put("ats", gemini_clients.DEFAULT_MODEL, prompt, json.dumps(values))
+    return values["Profile Summary"]
+
+def ats_batch_mode():
+    jd_text = st.text_area(
+        "Paste the Job Descriptions",
+        help="Separate job descriptions with a line containing only ---. The first line of each is its title.",
+    )
+    zip_file = st.file_uploader("Upload a Zip of Resumes (PDF)", type="zip")
+    top_k = st.number_input("AI profile summaries for the top N matches (0 for none)",
+                            min_value=0, max_value=20, value=0)
+
+    if st.button("Score Resumes"):
+        jds = ats_batch.split_job_descriptions(jd_text)
+        if not (zip_file and jds):
+            st.warning("Please upload a zip of resumes and provide at least one job description.")
+            return
+        for title, jd in jds:
+            if not ats_scoring.has_keywords(jd):
+                st.warning(f"Skipped the job description \"{title}\": it has no English keywords to match on.")
+        jds = [(title, jd) for title, jd in jds if ats_scoring.has_keywords(jd)]
+        if not jds:
+            return
+        try:
+            resumes, skipped = ats_batch.read_resumes(zip_file)
+        except zipfile.BadZipFile:
+            st.warning("That file isn't a valid zip archive.")
+            return
+        for reason in skipped:
+            st.warning(reason)
+        if not resumes:
+            st.warning("No PDF resumes found in the zip.")
+            return
+
+        progress = st.progress(0.0)
+        table = st.empty()
+        # Results stream in as resumes are extracted; the table re-sorts as it grows
+        for done, total, frame, texts, errors in ats_batch.score_resumes(resumes, jds, documents.extractor):
+            progress.progress(done / total, text=f"{done}/{total} resumes scored")
+            table.dataframe(frame, use_container_width=True, hide_index=True)
+        for name, error in errors.items():
+            st.warning(f"Couldn't read {name}: {error}")
+
+        if top_k:
+            cache = get_llm_cache()
+            frame["Profile Summary"] = ""
+            summaries = ats_batch.summarize_top(frame, texts, jds, int(top_k),
+                                                lambda text, jd: profile_summary(text, jd, cache) or "N/A")
+            for name, summary in summaries:
+                frame.loc[frame["Resume"] == name, "Profile Summary"] = summary
+                table.dataframe(frame, use_container_width=True, hide_index=True)
+        st.session_state["ats_batch_results"] = frame
+    elif "ats_batch_results" in st.session_state:
+        st.dataframe(st.session_state["ats_batch_results"], use_container_width=True, hide_index=True)
+
 code_explainer_prompt = """
             You’re a proficient code educator with a specialization in breaking down complex programming concepts 
             into simple, easy-to-understand explanations. Your expertise lies in providing thorough line-by-line 
@@ -143,10 +308,10 @@ def code_explainer_bot():
     st.header("Code Explainer Bot")
 
     # Use a unique key for session state 
-    messages = st.session_state.setdefault("code_explainer_messages", [])
+    messages = get_history("code_explainer_messages")
 
     # Display chat history
-    display_chat_history(messages)
+    display_chat_history(messages, "code_explainer")
 
     # Get code snippet from user
     code_snippet = st.text_area("Paste your Python code here:")
@@ -166,11 +331,8 @@ def code_explainer_bot():
             # Add user's code to the chat history
             add_user_message(messages, f"```python\n{code_snippet}\n```")
 
-            # Get the explanation from the Gemini model
-            explanation = generate_response(final_prompt)
-
-            # Add the explanation to the chat history
-            add_assistant_message(messages, explanation)
+            # Stream the explanation from the Gemini model into the chat history
+            stream_assistant_message(messages, final_prompt, bot="code_explainer")
 
         else:
             st.warning("Please paste some Python code.")
@@ -188,257 +350,193 @@ def healerbeast_bff():
     st.header("Healerbeast (Your Virtual Friend)")
 
     # Unique session state key
-    messages = st.session_state.setdefault("healerbeast_messages", [])
+    history = get_history("healerbeast_messages")
 
     # Display chat history
-    display_chat_history(messages)
+    display_chat_history(history, "healerbeast")
 
     # Get user input
     user_input = get_user_input("How are you feeling? Tell me anything.")
 
     if user_input:
-        add_user_message(messages, user_input)
-
         # You can use NLP later to extract feelings more accurately
         current_feelings = user_input
 
-        final_prompt = healerbeast_prompt.format(
+        final_prompt = with_context(history, healerbeast_prompt.format(
             current_feelings=current_feelings,
             user_message=user_input
-        )
+        ))
 
-        response_text = generate_response(final_prompt)
-        add_assistant_message(messages, response_text)
+        add_user_message(history, user_input)
+        stream_assistant_message(history, final_prompt, bot="healerbeast")
             
 def qanda_bot():
     st.header("Q&A Bot")
 
-    # Initialize chat history if it doesn't exist
-    if "qanda_messages" not in st.session_state:
-        st.session_state["qanda_messages"] = []
+    history = get_history("qanda_messages")
+
+    # Display chat history BEFORE processing the input; new messages render themselves
+    display_chat_history(history, "qanda")
 
-    # Get user input OUTSIDE the 'if' block
     user_input = get_user_input("Ask a question:")
 
     # Process user input
     if user_input:
-        add_user_message(st.session_state["qanda_messages"], user_input)
-        prompt = f"Your Prompt for Q&A Bot using {user_input}" 
-        response_text = generate_response(prompt)
-        add_assistant_message(st.session_state["qanda_messages"], response_text)
-
-    # Display chat history AFTER processing the input
-    display_chat_history(st.session_state["qanda_messages"])
-
-def transcribe_file(file_path):
-    headers = {
-        "authorization": ASSEMBLY_AI_API_KEY,
-        "content-type": "application/json"
-    }
-
-    with open(file_path, "rb") as f:
-        response = requests.post("https://api.assemblyai.com/v2/upload", headers=headers, data=f)
-        response.raise_for_status()
-    upload_url = response.json()["upload_url"]
-    data = {"audio_url": upload_url}
-
-    response = requests.post("https://api.assemblyai.com/v2/transcript", json=data, headers=headers)
-    response.raise_for_status()
-    transcript_id = response.json()["id"]
-
-    while True:
-        response = requests.get(f"https://api.assemblyai.com/v2/transcript/{transcript_id}", headers=headers)
-        response.raise_for_status()
-        status = response.json()["status"]
-
-        if status == "completed":
-            return response.json()["text"]
-        elif status == "error":
-            error_message = response.json().get("error", "Unknown error")
-            raise Exception(f"Transcription failed: {error_message}")
-        time.sleep(5)
+        prompt, query = turn_prompt(history, user_input, f"Your Prompt for Q&A Bot using {user_input}")
+        add_user_message(history, user_input)
+        stream_assistant_message(history, prompt, bot="qanda", query=query)
 
 # Function to create PDF
-def create_pdf(text):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, text)
-    
-    pdf_output = pdf.output(dest='S').encode('latin1')  # Output PDF as string
-    return pdf_output
-
-# Function to get summary from AssemblyAI
-def get_summary(audio_url):
-    headers = {
-        "authorization": ASSEMBLY_AI_API_KEY,
-        "content-type": "application/json"
-    }
-
-    data = {
-        "audio_url": audio_url,
-        "summarization": True,
-    }
-
-    response = requests.post("https://api.assemblyai.com/v2/transcript", json=data, headers=headers)
-    response.raise_for_status()
-    transcript_id = response.json()["id"]
-
-    while True:
-        response = requests.get(f"https://api.assemblyai.com/v2/transcript/{transcript_id}", headers=headers)
-        response.raise_for_status()
-        status = response.json()["status"]
-
-        if status == "completed":
-            return response.json()["summary"]
-        elif status == "error":
-            error_message = response.json().get("error", "Unknown error")
-            raise Exception(f"Summarization failed: {error_message}")
-        time.sleep(5)
+def transcript_pdf_download(job):
+    """Returns a callable for st.download_button that renders the PDF on click and caches it in the store."""
+    store = get_transcription_engine().store
+
+    def pdf_bytes():
+        data = store.get_file(job.digest, transcript_pdf.file_name(job.transcript),
+                              lambda path: transcript_pdf.write_pdf(job.transcript, path))
+        return data if data is not None else transcript_pdf.render_bytes(job.transcript)
+    return pdf_bytes
+
+@st.cache_resource
+def get_transcription_engine():
+    """One job engine per process, shared by every session."""
+    return transcription_jobs.JobEngine(
+        transcription_jobs.AssemblyAIClient(get_config()['assemblyai_api_key']),
+        store=transcript_store.TranscriptStore(),
+    )
+
+def submit_transcription(uploaded_file, parallel=False):
+    """Saves the upload to a temp file and queues it; returns the job id."""
+    suffix = os.path.splitext(uploaded_file.name)[1].lower()
+    file_path, digest = transcription_jobs.save_upload(uploaded_file, suffix=suffix)
+    job = get_transcription_engine().submit(file_path, name=uploaded_file.name, parallel=parallel, digest=digest)
+    return job.id
+
+def show_transcription_result(job):
+    st.text_area("Transcript:", job.transcript, height=300, key=f"transcript_{job.id}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Download Transcript as TXT",
+            data=job.transcript,
+            file_name="transcript.txt",
+            mime="text/plain",
+            key=f"txt_{job.id}",
+        )
+    with col2:
+        st.download_button(
+            label="Download Transcript as PDF",
+            data=transcript_pdf_download(job),
+            file_name="transcript.pdf",
+            mime="application/pdf",
+            key=f"pdf_{job.id}",
+        )
+
+    if job.summary:
+        st.subheader("Summary:")
+        st.write(job.summary)
+
+def show_transcription_jobs():
+    """Lists this session's jobs; returns True while any of them are still running."""
+    engine = get_transcription_engine()
+    jobs = [engine.get(job_id) for job_id in st.session_state["transcription_jobs"]]
+    jobs = [job for job in jobs if job is not None]
+
+    for job in reversed(jobs):
+        with st.expander(f"{job.name} — {job.status} ({job.elapsed:.0f}s)", expanded=not job.done or job.status == "completed"):
+            if job.status == "completed":
+                show_transcription_result(job)
+            elif job.status == "failed":
+                st.error(f"Transcription failed: {job.error}")
+            elif job.status == "cancelled":
+                st.info("Cancelled.")
+            else:
+                st.write(job.detail)
+                if job.segments:
+                    done = sum(1 for segment in job.segments if segment["status"] == "completed")
+                    st.progress(done / len(job.segments))
+                    st.caption(" · ".join(
+                        f"{time.strftime('%H:%M:%S', time.gmtime(segment['start']))} {segment['status']}"
+                        for segment in job.segments
+                    ))
+                if st.button("Cancel", key=f"cancel_{job.id}"):
+                    engine.cancel(job.id)
+
+    return any(not job.done for job in jobs)
+
+if getattr(st, "fragment", None):
+    @st.fragment(run_every=2)
+    def poll_transcription_jobs():
+        """Refreshes only the jobs panel, not the whole page, until every job has finished."""
+        if not show_transcription_jobs():
+            st.rerun()
+else:
+    def poll_transcription_jobs():
+        # Older Streamlit without fragments: poll by rerunning the whole script
+        if show_transcription_jobs():
+            time.sleep(2)
+            st.rerun()
 
 def transcription_bot():
     st.header("Transcription Bot")
+    st.session_state.setdefault("transcription_jobs", [])
 
     uploaded_file = st.file_uploader(
         "Choose an audio or video file", type=["mp3", "mp4", "avi", "mov"]
     )
 
-    if uploaded_file is not None:
-        try:
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_file.write(uploaded_file.getvalue())
-                file_path = temp_file.name
-
-            # Process video files
-            if file_path.lower().endswith((".mp4", ".avi", ".mov")):
-                audio = AudioSegment.from_file(file_path, format=file_path.split(".")[-1])
-                audio_path = os.path.splitext(file_path)[0] + ".mp3"
-                audio.export(audio_path, format="mp3")
-                file_path = audio_path
-
-            with st.spinner("Transcribing... This may take a few minutes."):
-                transcript, summary, audio_url = process_audio(file_path)
-
-            if transcript:
-                st.success("Transcription complete!")
-                st.text_area("Transcript:", transcript, height=300)
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.download_button(
-                        label="Download Transcript as TXT",
-                        data=transcript,
-                        file_name="transcript.txt",
-                        mime="text/plain",
-                    )
-                with col2:
-                    pdf_output = create_pdf(transcript)
-                    st.download_button(
-                        label="Download Transcript as PDF",
-                        data=pdf_output,
-                        file_name="transcript.pdf",
-                        mime="application/pdf",
-                    )
-
-                if summary:
-                    st.header("Summary:")
-                    st.write(summary)
-            else:
-                st.error("Transcription failed. Please try again.")
+    # Splitting needs ffmpeg; without it every file is sent as a single job
+    parallel = transcription_jobs.ffmpeg_available() and st.checkbox(
+        "Split long recordings at pauses and transcribe the parts in parallel",
+        help="Recordings over 15 minutes are cut into ~10 minute segments.",
+    )
 
+    if uploaded_file is not None and st.button("Transcribe"):
+        try:
+            st.session_state["transcription_jobs"].append(submit_transcription(uploaded_file, parallel))
         except Exception as e:
             st.error(f"An error occurred: {e}")
 
-@st.cache_data  # Cache the results for performance
-def process_audio(file_path):
-    """Processes the audio file: uploads, transcribes, and summarizes."""
-    headers = {"authorization": ASSEMBLY_AI_API_KEY}
-    response = requests.post(
-        "https://api.assemblyai.com/v2/upload",
-        headers=headers,
-        data=open(file_path, "rb"),
-    )
-    response.raise_for_status()
-    audio_url = response.json()["upload_url"]
-
-    transcript = transcribe_file(file_path)
-    summary = get_summary(audio_url) if transcript else None
-
-    return transcript, summary, audio_url
+    engine = get_transcription_engine()
+    if any(engine.get(job_id) and not engine.get(job_id).done for job_id in st.session_state["transcription_jobs"]):
+        poll_transcription_jobs()
+    elif st.session_state["transcription_jobs"]:
+        show_transcription_jobs()
 
 CHATBOTS = {
     "Thesis Writer": {
         "function": lambda: st.write("Thesis Writer function called"),
         "description": "Get help brainstorming, structuring, and writing your thesis.",
-        "lottie": "https://assets5.lottiefiles.com/packages/lf20_khzniaya.json",
+        "lottie": ANIMATIONS["thesis_writer"],
     },
     "Resume ATS Score": {
         "function": lambda: st.write("Resume ATS Score function called"),
         "description": "Analyze your resume for ATS compatibility and get improvement tips.",
-        "lottie": "https://assets5.lottiefiles.com/private_files/lf30_gcroxmje.json",
+        "lottie": ANIMATIONS["resume_ats_score"],
     },
     "Code Explainer": {
         "function": lambda: st.write("Code Explainer function called"),
         "description": "Get clear and concise explanations of your Python code.",
-        "lottie": "https://assets5.lottiefiles.com/packages/lf20_CTaizi.json",
+        "lottie": ANIMATIONS["code_explainer"],
     },
     "Healerbeast BFF": {
         "function": lambda: st.write("Healerbeast BFF function called"),
         "description": "Chat with a friendly and supportive virtual friend.",
-        "lottie": "https://assets1.lottiefiles.com/private_files/lf30_bb9bkg1h.json",
+        "lottie": ANIMATIONS["healerbeast_bff"],
     },
     "Q&A": {
         "function": lambda: st.write("Q&A function called"),
         "description": "Ask questions and get answers on a wide range of topics.",
-        "lottie": "https://assets2.lottiefiles.com/packages/lf20_zw0djhar.json",
+        "lottie": ANIMATIONS["qanda"],
     },
     "Transcription": {
         "function": lambda: st.write("Transcription function called"),
         "description": "Transcribe and summarize your audio and video files.",
-        "lottie": "https://assets1.lottiefiles.com/packages/lf20_wc1wtcet.json",
+        "lottie": ANIMATIONS["transcription"],
     },
 }
 
-fallback_icon = {
-    "v": "5.5.7",
-    "fr": 60,
-    "ip": 0,
-    "op": 60,
-    "w": 100,
-    "h": 100,
-    "nm": "Fallback",
-    "ddd": 0,
-    "assets": [],
-    "layers": [{
-        "ddd": 0,
-        "ind": 1,
-        "ty": 4,
-        "nm": "Shape Layer 1",
-        "sr": 1,
-        "ks": {
-            "o": {"a": 0, "k": 100, "ix": 11},
-            "r": {"a": 0, "k": 0, "ix": 10},
-            "p": {"a": 0, "k": [50, 50, 0], "ix": 2},
-            "a": {"a": 0, "k": [0, 0, 0], "ix": 1},
-            "s": {"a": 0, "k": [100, 100, 100], "ix": 6}
-        },
-        "ao": 0,
-        "shapes": [{
-            "ty": "rc",
-            "d": 1,
-            "s": {"a": 0, "k": [50, 50], "ix": 2},
-            "p": {"a": 0, "k": [0, 0], "ix": 3},
-            "r": {"a": 0, "k": 0, "ix": 4},
-            "nm": "Rectangle Path 1",
-            "mn": "ADBE Vector Shape - Rect",
-            "hd": False
-        }],
-        "ip": 0,
-        "op": 60,
-        "st": 0,
-        "bm": 0
-    }]
-}
 def chatbot():
     st.header("Choose Your AI Assistant")
 
@@ -0,0 +1,225 @@
+"""PDF text extraction for uploaded documents.
+
+Pages are extracted in parallel by a pool of worker processes (PyPDF2 is
+pure Python, so threads wouldn't help) and joined once at the end. Results
+are cached in memory by the SHA-256 of the file, so re-analysing the same
+upload costs nothing. Files over `MAX_BYTES` are rejected, and only the
+first `MAX_PAGES` pages are read.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from lazy import lazy_import
+
+PyPDF2 = lazy_import("PyPDF2")
+
+MAX_BYTES = int(os.environ.get("PORTFOLIO_MAX_PDF_BYTES", str(20 * 1024 * 1024)))
+MAX_PAGES = int(os.environ.get("PORTFOLIO_MAX_PDF_PAGES", "100"))
+WORKERS = int(os.environ.get("PORTFOLIO_PDF_WORKERS", str(min(os.cpu_count() or 1, 8))))
+PARALLEL_MIN_PAGES = 16  # below this, worker round trips cost more than they save
+CACHE_CHARS = 64 * 1024 * 1024  # total extracted text kept in memory
+
+
+class DocumentTooLarge(ValueError):
+    pass
+
+
+class DocumentUnreadable(ValueError):
+    pass
+
+
+class Document:
+    """Extracted text of a PDF, page by page."""
+
+    def __init__(self, digest, pages, page_count, truncated):
+        self.digest = digest
+        self.pages = pages
+        self.page_count = page_count  # pages in the file, including any beyond the cap
+        self.truncated = truncated
+        self.text = "\n".join(pages)
+
+
+def read_upload(uploaded, max_bytes=MAX_BYTES):
+    """Returns the bytes of a path, bytes or file-like upload, refusing anything over `max_bytes`."""
+    if isinstance(uploaded, (bytes, bytearray)):
+        data = bytes(uploaded)
+    elif isinstance(uploaded, str):
+        with open(uploaded, "rb") as f:
+            data = f.read(max_bytes + 1)
+    else:
+        uploaded.seek(0)
+        data = uploaded.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise DocumentTooLarge(f"PDFs larger than {max_bytes // (1024 * 1024)} MB aren't accepted.")
+    return data
+
+
+def extract_pages(data, start, stop):
+    """Text of pages [start, stop) of a PDF; runs in a worker process."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_document(data, max_pages):
+    """(page texts, total page count) of a whole PDF, up to `max_pages`; runs in a worker process."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    limit = min(page_count, max_pages) if max_pages else page_count
+    return [reader.pages[i].extract_text() or "" for i in range(limit)], page_count
+
+
+class DocumentExtractor:
+    """Extracts PDFs with a shared process pool and an in-memory cache keyed by content hash."""
+
+    def __init__(self, workers=WORKERS, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, cache_chars=CACHE_CHARS):
+        self.workers = workers
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.cache_chars = cache_chars
+        self._cache = OrderedDict()
+        self._cached_chars = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn, not fork: forking the multi-threaded Streamlit server is unsafe
+                    self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _reset(self, pool):
+        """Drops a pool whose worker died, so the next call starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _extract_ranges(self, data, limit):
+        """Pages [0, limit) split across the pool; retried once in a fresh pool if a worker dies."""
+        # A few contiguous ranges per worker: each range re-parses the file once
+        step = max(limit // (self.workers * 2), 1)
+        for attempt in range(2):
+            pool = self.pool()
+            futures = [pool.submit(extract_pages, data, start, min(start + step, limit))
+                       for start in range(0, limit, step)]
+            try:
+                return [page for future in futures for page in future.result()]
+            except BrokenProcessPool:
+                self._reset(pool)
+        raise DocumentUnreadable("This PDF couldn't be read.")
+
+    def _extract_isolated(self, data):
+        """Extracts one file alone in the pool, so if it kills its worker, only it fails."""
+        pool = self.pool()
+        try:
+            return pool.submit(extract_document, data, self.max_pages).result()
+        except BrokenProcessPool:
+            self._reset(pool)
+            raise DocumentUnreadable("This PDF couldn't be read.") from None
+
+    def extract(self, uploaded):
+        """Returns the Document for a PDF (path, bytes or file-like)."""
+        data = read_upload(uploaded, self.max_bytes)
+        digest = hashlib.sha256(data).hexdigest()
+        document = self._cached(digest)
+        if document is not None:
+            return document
+
+        try:
+            page_count = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+            limit = min(page_count, self.max_pages) if self.max_pages else page_count
+            if limit < PARALLEL_MIN_PAGES or self.workers < 2:
+                pages = extract_pages(data, 0, limit)
+            else:
+                pages = self._extract_ranges(data, limit)
+        except DocumentUnreadable:
+            raise
+        except Exception as e:
+            # Malformed PDFs raise whatever PyPDF2 trips over, not just PdfReadError
+            raise DocumentUnreadable("This PDF couldn't be read.") from e
+
+        document = Document(digest, pages, page_count, truncated=limit < page_count)
+        self._remember(document)
+        return document
+
+    def extract_many(self, named_files):
+        """Yields (name, Document or exception) for (name, bytes) pairs, in order of completion.
+
+        Each file is one worker task, so a batch of short resumes keeps every
+        worker busy. Cached files are yielded straight away.
+        """
+        futures = {}
+        pool = None
+        for name, data in named_files:
+            if len(data) > self.max_bytes:
+                yield name, DocumentTooLarge(f"{name} is larger than {self.max_bytes // (1024 * 1024)} MB")
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            document = self._cached(digest)
+            if document is not None:
+                yield name, document
+                continue
+            pool = pool or self.pool()
+            futures[pool.submit(extract_document, data, self.max_pages)] = (name, digest, data)
+
+        broken = []
+        for future in as_completed(futures):
+            name, digest, data = futures[future]
+            try:
+                pages, page_count = future.result()
+            except BrokenProcessPool:
+                broken.append((name, digest, data))
+                continue
+            except Exception as e:
+                yield name, e
+                continue
+            yield name, self._document(digest, pages, page_count)
+
+        if broken:
+            # A worker died and took every pending file with it; retry those one at a time
+            self._reset(pool)
+            for name, digest, data in broken:
+                try:
+                    pages, page_count = self._extract_isolated(data)
+                except Exception as e:
+                    yield name, e
+                    continue
+                yield name, self._document(digest, pages, page_count)
+
+    def _document(self, digest, pages, page_count):
+        document = Document(digest, pages, page_count, truncated=len(pages) < page_count)
+        self._remember(document)
+        return document
+
+    def _cached(self, digest):
+        with self._lock:
+            document = self._cache.get(digest)
+            if document is not None:
+                self._cache.move_to_end(digest)
+            return document
+
+    def _remember(self, document):
+        with self._lock:
+            if document.digest in self._cache:
+                return
+            self._cache[document.digest] = document
+            self._cached_chars += len(document.text)
+            while self._cached_chars > self.cache_chars and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_chars -= len(evicted.text)
+
+
+extractor = DocumentExtractor()
+
+
+def extract_text(uploaded):
+    """Returns the text of a PDF upload, using the shared extractor and cache."""
+    return extractor.extract(uploaded).text
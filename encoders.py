@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = int(os.environ.get("PORTFOLIO_B64_CACHE_BYTES", 64 * 1024 * 1024))
+
+
+class Base64Cache:
+    """Process-wide LRU of base64 payloads, bounded by total encoded bytes.
+
+    Files are keyed by path, mtime and size, so an edited file is re-encoded on
+    its next use. Raw bytes are keyed by their sha1 digest.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted_bytes = 0
+        self._entries = OrderedDict()
+        self._keys_by_path = {}
+        self._lock = threading.Lock()
+
+    def encode_file(self, path):
+        """Returns the base64 encoding of a file, reusing a cached copy if the file is unchanged."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+        with self._lock:
+            stale_key = self._keys_by_path.get(path)
+            if stale_key is not None and stale_key != key:
+                self._remove(stale_key)
+            self._keys_by_path[path] = key
+        self._put(key, encoded)
+        return encoded
+
+    def encode_bytes(self, data):
+        """Returns the base64 encoding of in-memory bytes."""
+        key = ("bytes", hashlib.sha1(data).hexdigest(), len(data))
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        encoded = base64.b64encode(data).decode()
+        self._put(key, encoded)
+        return encoded
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evicted_bytes": self.evicted_bytes,
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self.current_bytes = 0
+
+    def _get(self, key):
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return encoded
+
+    def _put(self, key, encoded):
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = encoded
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.current_bytes -= len(old_value)
+                self.evicted_bytes += len(old_value)
+                if old_key[0] != "bytes" and self._keys_by_path.get(old_key[0]) == old_key:
+                    del self._keys_by_path[old_key[0]]
+
+    def _remove(self, key):
+        encoded = self._entries.pop(key, None)
+        if encoded is not None:
+            self.current_bytes -= len(encoded)
+
+
+_cache = Base64Cache()
+
+
+def encode_file(path):
+    """Base64-encodes a file through the shared cache."""
+    return _cache.encode_file(path)
+
+
+def encode_bytes(data):
+    """Base64-encodes bytes through the shared cache."""
+    return _cache.encode_bytes(data)
+
+
+def data_uri(path, mime):
+    return f"data:{mime};base64,{encode_file(path)}"
+
+
+def cache_stats():
+    """Returns hit/miss/eviction counters for the shared cache."""
+    return _cache.stats()
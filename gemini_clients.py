@@ -0,0 +1,157 @@
+"""Process-wide Gemini client registry.
+
+`genai.configure` rebuilds the SDK's API client, and with it the gRPC channel.
+Calling it on every request threw away the open connection and paid a fresh
+TLS handshake each time. The registry configures the SDK once, keeps one
+`GenerativeModel` per model name, and records every call's latency (and,
+for streamed calls, time to first token) in a fixed-bucket histogram per
+(bot, model, metric).
+"""
+import bisect
+import hashlib
+import threading
+import time
+
+from lazy import lazy_import
+
+genai = lazy_import("google.generativeai")
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+LATENCY_BUCKETS_MS = [100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+
+
+class LatencyHistogram:
+    """Counts of call latencies per bucket, plus a running sum for the mean."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last bucket is "slower than every bound"
+        self.total_ms = 0.0
+        self.errors = 0
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, ms, error=False):
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.total_ms += ms
+        self.errors += int(error)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (None if it's past the last bound)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + [None], self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self):
+        labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def request_key(model_name, prompt, kwargs):
+    """Identifies identical requests, so the scheduler can coalesce them."""
+    return hashlib.sha256(f"{model_name}\0{prompt}\0{sorted(kwargs.items())!r}".encode()).hexdigest()
+
+
+class GeminiRegistry:
+    """Configures the Gemini SDK once and hands out warm, shared model instances."""
+
+    def __init__(self, api_key_loader, scheduler=None):
+        self._api_key_loader = api_key_loader
+        self.scheduler = scheduler
+        self._configured = False
+        self._models = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _configure(self):
+        if not self._configured:
+            with self._lock:
+                if not self._configured:
+                    genai.configure(api_key=self._api_key_loader())
+                    self._configured = True
+
+    def model(self, model_name=DEFAULT_MODEL):
+        """Returns the shared `GenerativeModel` for `model_name`, creating it on first use."""
+        self._configure()
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.setdefault(model_name, genai.GenerativeModel(model_name))
+        return model
+
+    def observe(self, bot, model_name, ms, error=False, metric="latency"):
+        with self._lock:
+            histogram = self._histograms.setdefault((bot, model_name, metric), LatencyHistogram())
+            histogram.observe(ms, error)
+
+    def generate(self, prompt, model_name=DEFAULT_MODEL, bot="default", **kwargs):
+        """Runs `generate_content` on the shared model and returns the response text."""
+        model = self.model(model_name)
+        start = time.perf_counter()
+        try:
+            if self.scheduler:
+                text = self.scheduler.call(bot, request_key(model_name, prompt, kwargs),
+                                           lambda: model.generate_content(prompt, **kwargs).text)
+            else:
+                text = model.generate_content(prompt, **kwargs).text
+        except Exception:
+            self.observe(bot, model_name, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        self.observe(bot, model_name, (time.perf_counter() - start) * 1000)
+        return text
+
+    def stream(self, prompt, model_name=DEFAULT_MODEL, bot="default", **kwargs):
+        """Yields the response text in pieces as Gemini produces them.
+
+        Records time to first token as the "ttft" metric, and the full call as
+        "latency".
+        """
+        model = self.model(model_name)
+        start = time.perf_counter()
+        first_token = None
+        error = False
+
+        def open_stream():
+            for chunk in model.generate_content(prompt, stream=True, **kwargs):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # a chunk without text parts, e.g. only safety metadata
+                if text:
+                    yield text
+
+        if self.scheduler:
+            chunks = self.scheduler.stream(bot, request_key(model_name, prompt, kwargs), open_stream)
+        else:
+            chunks = open_stream()
+        try:
+            for text in chunks:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                    self.observe(bot, model_name, (first_token - start) * 1000, metric="ttft")
+                yield text
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.observe(bot, model_name, (time.perf_counter() - start) * 1000, error=error)
+
+    def latency_report(self):
+        """Returns {(bot, model_name, metric): histogram snapshot} for everything recorded so far."""
+        with self._lock:
+            return {key: histogram.snapshot() for key, histogram in self._histograms.items()}
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def edge_index(node_ids, edges):
+    """Returns an (m, 2) int array of edge endpoints, skipping edges to unknown nodes."""
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    pairs = [(position[s], position[t]) for s, t in edges if s in position and t in position and s != t]
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def spectral_layout(node_ids, edges):
+    """Places nodes using the two smallest non-trivial eigenvectors of the graph Laplacian."""
+    n = len(node_ids)
+    if n <= 2:
+        return circular_layout(n)
+    pairs = edge_index(node_ids, edges)
+    adjacency = np.zeros((n, n))
+    adjacency[pairs[:, 0], pairs[:, 1]] = 1.0
+    adjacency[pairs[:, 1], pairs[:, 0]] = 1.0
+    laplacian = np.diag(adjacency.sum(axis=1)) - adjacency
+    _, vectors = np.linalg.eigh(laplacian)
+    pos = vectors[:, 1:3]
+    # Eigenvectors are only defined up to sign; pin it so the layout is deterministic
+    signs = np.sign(pos[np.argmax(np.abs(pos), axis=0), [0, 1]])
+    signs[signs == 0] = 1.0
+    return pos * signs
+
+
+def circular_layout(n):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack([np.cos(angles), np.sin(angles)])
+
+
+def spring_layout(node_ids, edges, iterations=200, seed=42, scale=300.0):
+    """Deterministic Fruchterman-Reingold layout.
+
+    Starts from the spectral layout (plus a little seeded jitter so disconnected
+    nodes don't overlap), then runs vectorized force iterations with linear
+    cooling. Returns {node_id: (x, y)} scaled to roughly +/- `scale` pixels.
+    Memory and time are O(n^2) per iteration, so keep it to a few thousand nodes.
+    """
+    n = len(node_ids)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {node_ids[0]: (0.0, 0.0)}
+
+    rng = np.random.default_rng(seed)
+    pairs = edge_index(node_ids, edges)
+    pos = spectral_layout(node_ids, edges)
+    pos = pos / (np.abs(pos).max() or 1.0) + rng.normal(scale=0.01, size=(n, 2))
+
+    k = np.sqrt(1.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.linalg.norm(delta, axis=-1)
+        np.fill_diagonal(distance, 1.0)
+        distance = np.maximum(distance, 0.01)
+        # Repulsion between every pair of nodes
+        displacement = np.einsum("ijk,ij->ik", delta, k * k / distance ** 2)
+        # Attraction along edges
+        if len(pairs):
+            edge_delta = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+            edge_distance = np.maximum(np.linalg.norm(edge_delta, axis=1), 0.01)
+            pull = edge_delta * (edge_distance / k)[:, None]
+            np.add.at(displacement, pairs[:, 0], -pull)
+            np.add.at(displacement, pairs[:, 1], pull)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature -= cooling
+
+    pos -= pos.mean(axis=0)
+    pos *= scale / (np.abs(pos).max() or 1.0)
+    return {node_id: (float(x), float(y)) for node_id, (x, y) in zip(node_ids, pos)}
+
+
+def group_layout(node_ids, groups, scale=300.0):
+    """O(n) layout for large graphs: groups on a ring, nodes in a sunflower spiral around each centre."""
+    n = len(node_ids)
+    if n == 0:
+        return {}
+    groups = np.asarray(groups, dtype=object)
+    unique, inverse, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    centres = circular_layout(len(unique)) * (scale if len(unique) > 1 else 0.0)
+    # Rank of each node within its group, so spirals start at the centre
+    order = np.argsort(inverse, kind="stable")
+    rank = np.empty(n, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank[order] = np.arange(n) - np.repeat(starts, counts)
+    radius = scale / max(np.sqrt(len(unique)), 1.0) * 0.8
+    r = radius * np.sqrt((rank + 0.5) / counts[inverse])
+    theta = rank * np.pi * (3 - np.sqrt(5))
+    pos = centres[inverse] + np.column_stack([r * np.cos(theta), r * np.sin(theta)])
+    return {node_id: (float(x), float(y)) for node_id, (x, y) in zip(node_ids, pos)}
+
+
+def layout(node_ids, edges, groups, max_spring_nodes=300):
+    """Picks the force-directed layout for small graphs and the grouped layout for large ones."""
+    if len(node_ids) <= max_spring_nodes:
+        return spring_layout(node_ids, edges)
+    return group_layout(node_ids, groups)
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+import numpy as np
+
+GRAPH_DIR = os.path.join("data", "graphs")
+MAX_CACHED_VIEWS = 16  # filtered/aggregated views kept per graph; keys come from user selections
+
+
+class Graph:
+    """An immutable node/edge dataset with a CSR adjacency index.
+
+    Nodes are dicts with at least "id" and "group"; edges are dicts with
+    "source", "target" and an optional "label". Edges are treated as
+    undirected for neighbor queries.
+    """
+
+    def __init__(self, nodes, edges, heading="", digest=None):
+        self.heading = heading
+        self.nodes = list(nodes)
+        self.position = {node["id"]: i for i, node in enumerate(self.nodes)}
+        self.edges = [e for e in edges if e["source"] in self.position and e["target"] in self.position]
+        self.groups = np.array([node.get("group", "") for node in self.nodes], dtype=object)
+        self.digest = digest or hashlib.sha256(
+            json.dumps({"nodes": self.nodes, "edges": self.edges}, sort_keys=True).encode()
+        ).hexdigest()
+        self._aggregates = OrderedDict()
+        self._filtered = OrderedDict()
+        self._views_lock = threading.Lock()
+        self._build_index()
+
+    def _build_index(self):
+        n = len(self.nodes)
+        if self.edges:
+            src = np.fromiter((self.position[e["source"]] for e in self.edges), dtype=np.int64, count=len(self.edges))
+            dst = np.fromiter((self.position[e["target"]] for e in self.edges), dtype=np.int64, count=len(self.edges))
+        else:
+            src = dst = np.zeros(0, dtype=np.int64)
+        self.edge_array = np.column_stack([src, dst])
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        order = np.argsort(rows, kind="stable")
+        self.indices = cols[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def as_dict(self):
+        return {"heading": self.heading, "nodes": self.nodes, "edges": self.edges}
+
+    def neighbors(self, node_id, depth=1):
+        """Returns the ids of nodes within `depth` hops of `node_id` (excluding itself)."""
+        start = self.position[node_id]
+        seen = {start}
+        frontier = np.array([start])
+        for _ in range(depth):
+            if not len(frontier):
+                break
+            reached = np.concatenate([self.indices[self.indptr[i]:self.indptr[i + 1]] for i in frontier])
+            frontier = np.array([i for i in np.unique(reached) if i not in seen], dtype=np.int64)
+            seen.update(frontier.tolist())
+        seen.discard(start)
+        return [self.nodes[i]["id"] for i in sorted(seen)]
+
+    def _view(self, cache, key, build):
+        """Returns `cache[key]`, building it on a miss and keeping only the most recent views."""
+        with self._views_lock:
+            view = cache.get(key)
+            if view is not None:
+                cache.move_to_end(key)
+                return view
+        view = build()
+        with self._views_lock:
+            view = cache.setdefault(key, view)
+            cache.move_to_end(key)
+            while len(cache) > MAX_CACHED_VIEWS:
+                cache.popitem(last=False)
+        return view
+
+    def filter_groups(self, groups):
+        """Returns the subgraph induced by nodes in `groups`."""
+        groups = frozenset(groups)
+
+        def build():
+            keep = {node["id"] for node in self.nodes if node.get("group") in groups}
+            return Graph(
+                [node for node in self.nodes if node["id"] in keep],
+                [e for e in self.edges if e["source"] in keep and e["target"] in keep],
+                heading=self.heading,
+            )
+        return self._view(self._filtered, groups, build)
+
+    def aggregate(self, max_nodes=200, expand=()):
+        """Collapses groups into super-nodes so the rendered graph has at most ~`max_nodes` nodes.
+
+        Groups listed in `expand` keep their individual nodes; every other group
+        becomes one node labelled with its size, and parallel edges between
+        super-nodes are merged into one edge weighted by how many they replace.
+        Expanded groups share what's left of the budget; one that doesn't fit
+        keeps its best-connected nodes and collapses the rest into an
+        "other" super-node. Graphs already small enough are returned unchanged.
+        """
+        if len(self.nodes) <= max_nodes and not expand:
+            return self
+        expand = frozenset(expand)
+        return self._view(self._aggregates, (max_nodes, expand), lambda: self._aggregate(max_nodes, expand))
+
+    def _aggregate(self, max_nodes, expand):
+        group_sizes = Counter(self.groups.tolist())
+        expanded = sorted(group for group in group_sizes if group in expand)
+        collapsed = len(group_sizes) - len(expanded)
+        share = max((max_nodes - collapsed) // max(len(expanded), 1), 1)
+
+        # Expanded groups over their share keep the (share - 1) highest-degree nodes, plus an "other" node
+        degree = self.degree
+        shown = set()
+        for group in expanded:
+            members = np.flatnonzero(self.groups == group)
+            if len(members) > share:
+                members = members[np.argsort(-degree[members], kind="stable")[:share - 1]]
+            shown.update(members.tolist())
+
+        def key(i):
+            group = self.groups[i]
+            if group not in expand:
+                return f"group:{group}"
+            return self.nodes[i]["id"] if i in shown else f"group:{group}:other"
+
+        nodes = []
+        for group, size in sorted(group_sizes.items()):
+            if group in expand:
+                members = [i for i in np.flatnonzero(self.groups == group).tolist() if i in shown]
+                nodes.extend(self.nodes[i] for i in members)
+                if len(members) < size:
+                    rest = size - len(members)
+                    nodes.append({"id": f"group:{group}:other", "group": group,
+                                  "label": f"{group}, other ({rest})", "size": rest, "super": True})
+            else:
+                nodes.append({"id": f"group:{group}", "group": group, "label": f"{group} ({size})",
+                              "size": size, "super": True})
+
+        weights = defaultdict(int)
+        for s, t in self.edge_array.tolist():
+            a, b = key(s), key(t)
+            if a != b:
+                weights[(a, b) if a < b else (b, a)] += 1
+        edges = [{"source": a, "target": b, "label": f"{w} links", "weight": w} for (a, b), w in weights.items()]
+        return Graph(nodes, edges, heading=self.heading)
+
+
+def load_graph(path):
+    """Loads a graph from a JSON file, or from a directory with nodes.parquet and edges.parquet."""
+    if os.path.isdir(path):
+        import pandas as pd
+        nodes = pd.read_parquet(os.path.join(path, "nodes.parquet")).to_dict("records")
+        edges = pd.read_parquet(os.path.join(path, "edges.parquet")).to_dict("records")
+        heading = os.path.basename(path).replace("_", " ").title()
+        return Graph(nodes, edges, heading=heading)
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    return Graph(data["nodes"], data["edges"], heading=data.get("heading", ""),
+                 digest=hashlib.sha256(raw).hexdigest())
+
+
+class GraphRegistry:
+    """Loads graphs by name from a directory, reloading a file when it changes."""
+
+    def __init__(self, root=GRAPH_DIR):
+        self.root = root
+        self._graphs = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, name):
+        json_path = os.path.join(self.root, f"{name}.json")
+        return json_path if os.path.exists(json_path) else os.path.join(self.root, name)
+
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.path.splitext(entry)[0] for entry in os.listdir(self.root)
+                      if entry.endswith(".json") or os.path.isdir(os.path.join(self.root, entry)))
+
+    def get(self, name):
+        path = self.path_for(name)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._graphs.get(name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        graph = load_graph(path)
+        with self._lock:
+            self._graphs[name] = (mtime, graph)
+        return graph
+
+
+registry = GraphRegistry()
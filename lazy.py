@@ -0,0 +1,36 @@
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Lets pages keep `module.function()` call sites while deferring heavy
+    imports (sklearn, statsmodels, google.generativeai, pydub, pyvis, ...)
+    until the page that needs them is first selected.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """Returns the module if it's already imported, otherwise a LazyModule proxy."""
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,248 @@
+"""Persistent LLM response cache with exact and similarity lookup.
+
+Responses are stored in SQLite (`.cache/llm_cache.sqlite3`), so they survive
+restarts and are shared by every session. A lookup first tries an exact
+match on the whitespace-normalised prompt. Then, for bots that allow it, it
+looks for a cached question whose TF-IDF vector has cosine similarity at or
+above the bot's threshold. The vectors use hashed word unigrams and bigrams,
+kept as SciPy sparse rows. Entries expire after their bot's TTL. Past
+`max_entries`, the least recently used are evicted. Hits and misses per bot
+are counted in the same database.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from lazy import lazy_import
+
+sparse = lazy_import("scipy.sparse")
+
+CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite3")
+MAX_ENTRIES = int(os.environ.get("PORTFOLIO_LLM_CACHE_ENTRIES", "5000"))
+VECTOR_DIM = 2 ** 12
+TOKEN = re.compile(r"\w+")
+
+DAY = 24 * 60 * 60
+# ttl in seconds (0 disables caching); similarity=None means exact matches only
+BOT_POLICIES = {
+    "qanda": {"ttl": 7 * DAY, "similarity": 0.9},
+    "thesis": {"ttl": DAY, "similarity": 0.95},
+    "code_explainer": {"ttl": 30 * DAY, "similarity": None},  # one changed line can change the answer
+    "ats": {"ttl": DAY, "similarity": None},
+    "healerbeast": {"ttl": 0, "similarity": None},  # personal conversations are never replayed
+}
+DEFAULT_POLICY = {"ttl": DAY, "similarity": None}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    bot TEXT NOT NULL,
+    query TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_bot ON responses (bot);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS stats (
+    bot TEXT PRIMARY KEY,
+    exact_hits INTEGER NOT NULL DEFAULT 0,
+    similar_hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def normalize(text):
+    return " ".join(text.split())
+
+
+def cache_key(bot, model_name, prompt):
+    return hashlib.sha256(f"{bot}\0{model_name}\0{normalize(prompt)}".encode()).hexdigest()
+
+
+def term_counts(text, dim=VECTOR_DIM):
+    """Hashed unigram and bigram counts of `text` as (columns, counts) arrays."""
+    words = TOKEN.findall(text.lower())
+    counts = Counter(zlib.crc32(term.encode()) % dim
+                     for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+    return (np.fromiter(counts.keys(), dtype=np.int32, count=len(counts)),
+            np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of one bot's cached queries, for cosine-similarity lookup.
+
+    Rows are kept as a sparse matrix of log term counts. Added rows are
+    stacked onto it in one go at the next lookup. The IDF weights and row
+    norms are recomputed only when rows have been added.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.document_frequency = np.zeros(VECTOR_DIM, dtype=np.float32)
+        self._pending = []  # (columns, log counts) not yet in the matrix
+        self._matrix = None
+        self._idf = None
+        self._norms = None
+
+    def add(self, key, query):
+        columns, counts = term_counts(query)
+        self.keys.append(key)
+        self.document_frequency[columns] += 1
+        self._pending.append((columns, np.log1p(counts)))
+        self._idf = None
+
+    def _weights(self):
+        """(matrix, idf, row norms) with any pending rows folded in."""
+        if self._pending:
+            lengths = [len(columns) for columns, _ in self._pending]
+            block = sparse.csr_matrix(
+                (np.concatenate([values for _, values in self._pending]),
+                 np.concatenate([columns for columns, _ in self._pending]),
+                 np.concatenate([[0], np.cumsum(lengths)])),
+                shape=(len(self._pending), VECTOR_DIM))
+            self._matrix = block if self._matrix is None else sparse.vstack([self._matrix, block], format="csr")
+            self._pending = []
+        if self._idf is None:
+            n = len(self.keys)
+            self._idf = np.log((1 + n) / (1 + self.document_frequency)) + 1
+            self._norms = np.sqrt(self._matrix.multiply(self._matrix) @ self._idf ** 2)
+        return self._matrix, self._idf, self._norms
+
+    def best_match(self, query):
+        """Returns (key, similarity) of the closest cached query, or (None, 0.0)."""
+        if not self.keys:
+            return None, 0.0
+        matrix, idf, norms = self._weights()
+        columns, counts = term_counts(query)
+        weighted = np.zeros(VECTOR_DIM, dtype=np.float32)
+        weighted[columns] = np.log1p(counts) * idf[columns]
+        query_norm = np.linalg.norm(weighted)
+        if query_norm == 0:
+            return None, 0.0
+        scores = (matrix @ (weighted * idf)) / (np.where(norms == 0, 1, norms) * query_norm)
+        best = int(np.argmax(scores))
+        return self.keys[best], float(scores[best])
+
+
+class LLMCache:
+    """SQLite-backed response cache with per-bot TTLs and similarity thresholds."""
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, policies=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.policies = policies or BOT_POLICIES
+        self._indexes = {}
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def policy(self, bot):
+        return self.policies.get(bot, DEFAULT_POLICY)
+
+    def enabled(self, bot):
+        return self.policy(bot)["ttl"] > 0
+
+    def _index(self, bot):
+        """The bot's similarity index, built from the database on first use."""
+        index = self._indexes.get(bot)
+        if index is None:
+            index = SimilarityIndex()
+            for key, query in self._db.execute("SELECT key, query FROM responses WHERE bot = ? AND query != ''",
+                                               (bot,)):
+                index.add(key, query)
+            self._indexes[bot] = index
+        return index
+
+    def _count(self, bot, column):
+        self._db.execute("INSERT OR IGNORE INTO stats (bot) VALUES (?)", (bot,))
+        self._db.execute(f"UPDATE stats SET {column} = {column} + 1 WHERE bot = ?", (bot,))
+
+    def _fresh(self, key, ttl, now):
+        row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and now - row[1] <= ttl:
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+        return None
+
+    def get(self, bot, model_name, prompt, query=None):
+        """Returns a cached response for the prompt, or None.
+
+        `query` is the user's own text (the prompt minus its template), which
+        is what similarity lookup compares. Without one, only an exact match
+        counts: a whole prompt is mostly template and conversation context,
+        so similar prompts can still be different questions.
+        """
+        policy = self.policy(bot)
+        if not policy["ttl"]:
+            return None
+        now = time.time()
+        with self._lock, self._db:
+            response = self._fresh(cache_key(bot, model_name, prompt), policy["ttl"], now)
+            if response is not None:
+                self._count(bot, "exact_hits")
+                return response
+            if policy["similarity"] is not None and query:
+                key, score = self._index(bot).best_match(query)
+                if key and score >= policy["similarity"]:
+                    response = self._fresh(key, policy["ttl"], now)
+                    if response is not None:
+                        self._count(bot, "similar_hits")
+                        return response
+            self._count(bot, "misses")
+        return None
+
+    def put(self, bot, model_name, prompt, response, query=None):
+        """Stores a response; only entries with a `query` take part in similarity lookup."""
+        if not self.enabled(bot) or not response:
+            return
+        key = cache_key(bot, model_name, prompt)
+        now = time.time()
+        with self._lock, self._db:
+            exists = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, bot, query, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, bot, normalize(query or ""), response, now, now),
+            )
+            if query and not exists and bot in self._indexes:
+                self._indexes[bot].add(key, normalize(query))
+            self._evict(now)
+
+    def _evict(self, now):
+        removed = 0
+        for bot, policy in self.policies.items():
+            if policy["ttl"]:
+                removed += self._db.execute("DELETE FROM responses WHERE bot = ? AND created_at < ?",
+                                            (bot, now - policy["ttl"])).rowcount
+        excess = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                (excess,)).rowcount
+        if removed:
+            self._indexes.clear()  # rebuilt lazily without the removed entries
+
+    def stats(self):
+        """Returns {bot: {"exact_hits", "similar_hits", "misses", "hit_rate", "entries"}}."""
+        with self._lock:
+            entries = dict(self._db.execute("SELECT bot, COUNT(*) FROM responses GROUP BY bot"))
+            rows = self._db.execute("SELECT bot, exact_hits, similar_hits, misses FROM stats").fetchall()
+        report = {}
+        for bot, exact, similar, misses in rows:
+            lookups = exact + similar + misses
+            report[bot] = {"exact_hits": exact, "similar_hits": similar, "misses": misses,
+                           "hit_rate": (exact + similar) / lookups if lookups else None,
+                           "entries": entries.get(bot, 0)}
+        return report
@@ -0,0 +1,291 @@
+"""Process-wide scheduler for outbound LLM calls.
+
+Every Streamlit session shares one scheduler. It enforces:
+
+- a concurrency cap (`PORTFOLIO_LLM_CONCURRENCY`), with free slots granted by
+  bot priority (interactive chat before batch work), first come first served
+  within a priority;
+- a token-bucket rate limit (`PORTFOLIO_LLM_RPM` requests per minute);
+- single-flight coalescing, where identical prompts already in flight share
+  one upstream call (streamed replies are fanned out chunk by chunk);
+- on 429 / quota errors, exponential backoff with jitter that also pauses
+  the bucket, so every caller slows down rather than piling on more 429s.
+
+Callers that can't get a slot within `max_wait` get `SchedulerBusy`, which
+they can show as "busy, try again" instead of hanging.
+"""
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+MAX_CONCURRENCY = int(os.environ.get("PORTFOLIO_LLM_CONCURRENCY", "4"))
+REQUESTS_PER_MINUTE = float(os.environ.get("PORTFOLIO_LLM_RPM", "30"))
+MAX_WAIT = 60.0  # seconds a call may queue before giving up
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# Lower runs first
+BOT_PRIORITIES = {
+    "qanda": 0,
+    "healerbeast": 0,
+    "thesis": 1,
+    "code_explainer": 1,
+    "ats": 2,
+    "history_summary": 3,
+}
+DEFAULT_PRIORITY = 2
+
+
+class SchedulerBusy(Exception):
+    pass
+
+
+def is_rate_limited(error):
+    """True for HTTP 429 / quota-exhausted errors from the Gemini SDK (or anything shaped like them)."""
+    code = getattr(error, "code", None)
+    if callable(code):
+        code = code()
+    value = getattr(code, "value", code)
+    if isinstance(value, tuple):  # grpc.StatusCode values are (number, name)
+        value = value[0]
+    if value in (429, 8):  # 8 is gRPC RESOURCE_EXHAUSTED
+        return True
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """Takes one token, sleeping until one is available; raises SchedulerBusy past `deadline`."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise SchedulerBusy("The assistant is busy right now, please try again in a minute.")
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stops handing out tokens for `seconds`, e.g. after the API says we're over quota."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class StreamFlight:
+    """Chunks of one in-flight streamed reply, replayed to every caller that asked the same thing."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def push(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def replay(self):
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.chunks) and not self.done:
+                    self._cond.wait()
+                chunks = self.chunks[index:]
+                done, error = self.done, self.error
+            for chunk in chunks:
+                yield chunk
+            index += len(chunks)
+            if done and index >= len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+class Scheduler:
+    """Concurrency cap, rate limit, priorities, coalescing and 429 backoff for LLM calls."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, requests_per_minute=REQUESTS_PER_MINUTE,
+                 priorities=None, max_wait=MAX_WAIT, max_retries=MAX_RETRIES):
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(requests_per_minute / 60, capacity=max(max_concurrency, 1))
+        self.priorities = priorities or BOT_PRIORITIES
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._waiting = []  # heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._active = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._stats = {"calls": 0, "coalesced": 0, "retries": 0, "rejected": 0}
+
+    def _count(self, name):
+        with self._flights_lock:
+            self._stats[name] += 1
+
+    def _acquire(self, bot, deadline):
+        """Waits for a concurrency slot, letting higher-priority callers go first."""
+        ticket = (self.priorities.get(bot, DEFAULT_PRIORITY), next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while self._active >= self.max_concurrency or self._waiting[0] != ticket:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SchedulerBusy("The assistant is busy right now, please try again in a minute.")
+                    self._cond.wait(remaining)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            self._active += 1
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _backoff(self, attempt):
+        """Sleeps before retry `attempt` with jittered exponential backoff, pausing everyone's bucket."""
+        self._count("retries")
+        cap = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+        delay = cap / 2 + random.uniform(0, cap / 2)
+        self.bucket.pause(delay)
+        time.sleep(delay)
+
+    def _attempts(self, bot):
+        """Yields attempt numbers while holding a slot and a rate-limit token for each one."""
+        deadline = time.monotonic() + self.max_wait
+        try:
+            self._acquire(bot, deadline)
+        except SchedulerBusy:
+            self._count("rejected")
+            raise
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    # Retries get a fresh wait budget, since backoff itself takes time
+                    self.bucket.acquire(deadline if attempt == 0 else time.monotonic() + self.max_wait)
+                except SchedulerBusy:
+                    self._count("rejected")
+                    raise
+                yield attempt
+        finally:
+            self._release()
+
+    def _run(self, bot, fn):
+        self._count("calls")
+        attempts = self._attempts(bot)
+        try:
+            for attempt in attempts:
+                try:
+                    return fn()
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    self._backoff(attempt)
+        finally:
+            attempts.close()
+
+    def call(self, bot, key, fn):
+        """Runs `fn()` under the scheduler; concurrent calls with the same `key` share one run."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+        if not leader:
+            self._count("coalesced")
+            return flight.result()
+        try:
+            result = self._run(bot, fn)
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+
+    def stream(self, bot, key, open_stream):
+        """Yields chunks from `open_stream()` under the scheduler, sharing identical in-flight streams.
+
+        A rate-limited stream is retried only if it failed before yielding
+        anything, so no one sees a chunk twice.
+        """
+        key = ("stream", key)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = StreamFlight()
+        if not leader:
+            self._count("coalesced")
+            yield from flight.replay()
+            return
+
+        self._count("calls")
+        attempts = self._attempts(bot)
+        try:
+            for attempt in attempts:
+                started = False
+                try:
+                    for chunk in open_stream():
+                        started = True
+                        flight.push(chunk)
+                        yield chunk
+                    break
+                except Exception as e:
+                    if started or not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    self._backoff(attempt)
+            flight.finish()
+        except GeneratorExit:
+            flight.finish(SchedulerBusy("The shared request was abandoned, please try again."))
+            raise
+        except BaseException as e:
+            flight.finish(e)
+            raise
+        finally:
+            attempts.close()
+            with self._flights_lock:
+                self._flights.pop(key, None)
+
+    def stats(self):
+        with self._cond:
+            active, waiting = self._active, len(self._waiting)
+        with self._flights_lock:
+            return dict(self._stats, active=active, waiting=waiting, in_flight_keys=len(self._flights))
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from assets import asset_url, background_css, get_asset_registry
+
+MEDIA_MANIFEST_PATH = os.path.join("optimized", "media.json")
+
+_manifest = {"mtime": None, "data": {}}
+_manifest_lock = threading.Lock()
+
+
+def load_media_manifest():
+    """Returns the transcoder manifest, reloading it when the file changes."""
+    try:
+        mtime = os.stat(MEDIA_MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _manifest_lock:
+        if _manifest["mtime"] != mtime:
+            with open(MEDIA_MANIFEST_PATH) as f:
+                _manifest["data"] = json.load(f)
+            _manifest["mtime"] = mtime
+        return _manifest["data"]
+
+
+def media_sources(path):
+    """Returns (poster_url, [(url, mime), ...]) for a clip, falling back to the original file."""
+    entry = load_media_manifest().get(path)
+    if not entry:
+        return None, [(asset_url(path), "video/mp4")]
+    sources = [(asset_url(s["path"]), s["type"]) for s in entry["sources"] if os.path.exists(s["path"])]
+    poster = asset_url(entry["poster"]) if os.path.exists(entry["poster"]) else None
+    return poster, sources or [(asset_url(path), "video/mp4")]
+
+
+def lazy_video(path, height=200):
+    """Renders a muted looping clip that shows only its poster until it scrolls into view.
+
+    Runs inside a component iframe because st.markdown doesn't execute scripts.
+    The <source> URLs are attached by an IntersectionObserver, so the browser
+    fetches video bytes (in range requests) only after first paint.
+
+    Without the asset server every URL would be a base64 data URI sent on
+    each rerun, so the clip is handed to st.video, which serves it by URL.
+    """
+    if get_asset_registry().server is None:
+        entry = load_media_manifest().get(path)
+        mp4 = [s["path"] for s in (entry or {}).get("sources", [])
+               if s["type"] == "video/mp4" and os.path.exists(s["path"])]
+        st.video(mp4[0] if mp4 else path, format="video/mp4", loop=True, autoplay=True, muted=True)
+        return
+    poster, sources = media_sources(path)
+    source_tags = "".join(f'<source data-src="{url}" type="{mime}">' for url, mime in sources)
+    poster_attr = f'poster="{poster}"' if poster else ""
+    components.html(f"""
+    <style>
+    body {{ margin: 0; }}
+    .lazy-video {{
+        width: 100%;
+        height: {height}px;
+        object-fit: cover;
+        border-radius: 10px;
+        background: #182848;
+    }}
+    </style>
+    <video class="lazy-video" muted loop playsinline preload="none" {poster_attr}>{source_tags}</video>
+    <script>
+    const video = document.querySelector('.lazy-video');
+    function load() {{
+        video.querySelectorAll('source[data-src]').forEach(s => {{ s.src = s.dataset.src; s.removeAttribute('data-src'); }});
+        video.load();
+        video.play().catch(() => {{}});
+    }}
+    if ('IntersectionObserver' in window) {{
+        const observer = new IntersectionObserver(entries => {{
+            if (entries.some(e => e.isIntersecting)) {{ observer.disconnect(); load(); }}
+        }}, {{ rootMargin: '200px' }});
+        observer.observe(video);
+    }} else {{
+        window.addEventListener('load', load);
+    }}
+    </script>
+    """, height=height + 10)
+
+
+def video_background(path, fallback_image=None):
+    """Uses a transcoded clip as the page background, painting its poster first.
+
+    The poster goes in as plain CSS so it shows on first paint; a zero-height
+    component then injects the <video> into the page once the browser is idle.
+    Without the asset server, only the smallest transcoded clip is inlined (a
+    few tens of KB, against the megabyte the GIF costs). Without a transcoded
+    clip, falls back to `fallback_image` (or `path`) as the background.
+    """
+    entry = load_media_manifest().get(path)
+    if not entry:
+        poster, sources = None, []
+    elif get_asset_registry().server is None:
+        # Every browser plays MP4, so one inlined clip is enough
+        mp4 = [s for s in entry["sources"] if s["type"] == "video/mp4" and os.path.exists(s["path"])]
+        smallest = min(mp4, key=lambda s: s["bytes"], default=None)
+        poster = asset_url(entry["poster"]) if smallest and os.path.exists(entry["poster"]) else None
+        sources = [(asset_url(smallest["path"]), "video/mp4")] if smallest else []
+        entry = entry if smallest else None
+    else:
+        poster, sources = media_sources(path)
+    background = f'.stApp {{ background-image: url("{poster}"); }}' if poster else background_css(fallback_image or path)
+    # The injected <video> is hidden unless this rule is on the page, so switching
+    # back to a static background hides it again on the next rerun
+    video_rule = """
+        #portfolio-bg-video { display: block !important; }
+        .stApp { background: transparent !important; }
+    """ if entry else ""
+    st.markdown(f"""
+    <style>
+    {background}
+    .stApp {{
+        background-size: cover;
+        background-attachment: fixed;
+    }}
+    {video_rule}
+    </style>
+    """, unsafe_allow_html=True)
+
+    if not video_rule:
+        return
+
+    sources_json = json.dumps([{"src": url, "type": mime} for url, mime in sources])
+    components.html(f"""
+    <script>
+    (function() {{
+        const doc = window.parent.document;
+        if (doc.getElementById('portfolio-bg-video')) return;
+        function inject() {{
+            const video = doc.createElement('video');
+            video.id = 'portfolio-bg-video';
+            video.muted = true;
+            video.loop = true;
+            video.autoplay = true;
+            video.playsInline = true;
+            video.setAttribute('preload', 'metadata');
+            video.style.cssText = 'display:none;position:fixed;inset:0;width:100vw;height:100vh;object-fit:cover;z-index:-1;pointer-events:none;';
+            {sources_json}.forEach(s => {{
+                const source = doc.createElement('source');
+                source.src = s.src;
+                source.type = s.type;
+                video.appendChild(source);
+            }});
+            doc.body.prepend(video);
+        }}
+        if ('requestIdleCallback' in window) requestIdleCallback(inject, {{ timeout: 2000 }});
+        else setTimeout(inject, 500);
+    }})();
+    </script>
+    """, height=0)
@@ -0,0 +1,251 @@
+"""Local stand-in for the AssemblyAI REST API, for offline development and load tests.
+
+Implements the endpoints the app uses (POST /v2/upload, POST /v2/transcript,
+GET/DELETE /v2/transcript/<id>). Transcripts move from "queued" to
+"processing" to "completed" on a timer that scales with the uploaded audio's
+length, estimated from its size at --bytes-per-minute.
+
+Run a server for the app:
+    python mock_assemblyai.py --port 8089
+    ASSEMBLYAI_BASE_URL=http://localhost:8089 streamlit run streamlit_app.py
+
+Load-test the job engine against it with N concurrent jobs:
+    python mock_assemblyai.py --load-test 300
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BYTES_PER_MINUTE = 1024 * 1024  # ~128 kbps MP3
+
+
+class MockState:
+    """Uploads and transcripts held in memory, plus request counters."""
+
+    def __init__(self, queue_seconds=0.5, seconds_per_audio_minute=2.0, base_seconds=1.0,
+                 bytes_per_minute=DEFAULT_BYTES_PER_MINUTE, error_rate=0.0):
+        self.queue_seconds = queue_seconds
+        self.seconds_per_audio_minute = seconds_per_audio_minute
+        self.base_seconds = base_seconds
+        self.bytes_per_minute = bytes_per_minute
+        self.error_rate = error_rate
+        self.uploads = {}
+        self.transcripts = {}
+        self.requests = {"upload": 0, "create": 0, "poll": 0}
+        self.lock = threading.Lock()
+
+    def count(self, kind):
+        with self.lock:
+            self.requests[kind] += 1
+
+    def audio_minutes(self, upload_url):
+        size = self.uploads.get(upload_url.rsplit("/", 1)[-1], 0)
+        return size / self.bytes_per_minute
+
+    def transcript_view(self, transcript):
+        """Returns the transcript as the API would report it right now."""
+        elapsed = time.time() - transcript["created_at"]
+        view = {k: v for k, v in transcript.items() if not k.startswith("_") and k != "created_at"}
+        if elapsed < self.queue_seconds:
+            view["status"] = "queued"
+        elif elapsed < self.queue_seconds + transcript["_processing_seconds"]:
+            view["status"] = "processing"
+        elif transcript["_fails"]:
+            view.update(status="error", error="Mock transcription error")
+        else:
+            minutes = transcript["_minutes"]
+            words = max(int(minutes * 150), 5)
+            view.update(
+                status="completed",
+                text=f"Mock transcript of {minutes:.2f} minutes of audio from {transcript['audio_url']}.",
+                audio_duration=round(minutes * 60, 2),
+                words=[{"text": f"word{i}", "start": int(i * minutes * 60000 / words),
+                        "end": int((i + 1) * minutes * 60000 / words)} for i in range(0, words, max(words // 20, 1))],
+            )
+            if transcript.get("summarization"):
+                view["summary"] = "- Mock summary bullet one\n- Mock summary bullet two"
+        return view
+
+
+class MockAssemblyAIHandler(BaseHTTPRequestHandler):
+    state = None
+    protocol_version = "HTTP/1.1"
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            size = 0
+            while True:
+                chunk_size = int(self.rfile.readline().strip().split(b";")[0], 16)
+                if chunk_size == 0:
+                    self.rfile.readline()
+                    return size
+                remaining = chunk_size
+                while remaining:
+                    remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+                self.rfile.readline()
+                size += chunk_size
+        length = int(self.headers.get("Content-Length", 0))
+        remaining = length
+        while remaining:
+            read = len(self.rfile.read(min(remaining, 1024 * 1024)))
+            if not read:
+                break
+            remaining -= read
+        return length
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        if not self.headers.get("authorization"):
+            self._send_json(401, {"error": "Authentication error, API token missing/invalid"})
+            return False
+        return True
+
+    def do_POST(self):
+        state = self.state
+        if self.path == "/v2/upload":
+            size = self._read_body()
+            if not self._authorized():
+                return
+            state.count("upload")
+            upload_id = uuid.uuid4().hex
+            with state.lock:
+                state.uploads[upload_id] = size
+            host = self.headers.get("Host", "localhost")
+            self._send_json(200, {"upload_url": f"http://{host}/files/{upload_id}"})
+        elif self.path == "/v2/transcript":
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not self._authorized():
+                return
+            state.count("create")
+            minutes = state.audio_minutes(request.get("audio_url", ""))
+            transcript = {
+                "id": uuid.uuid4().hex,
+                "audio_url": request.get("audio_url"),
+                "summarization": bool(request.get("summarization")),
+                "created_at": time.time(),
+                "_minutes": minutes,
+                "_processing_seconds": state.base_seconds + minutes * state.seconds_per_audio_minute,
+                "_fails": random.random() < state.error_rate,
+            }
+            with state.lock:
+                state.transcripts[transcript["id"]] = transcript
+            self._send_json(200, {"id": transcript["id"], "status": "queued"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_GET(self):
+        if not self.path.startswith("/v2/transcript/"):
+            self._send_json(404, {"error": "Not found"})
+            return
+        if not self._authorized():
+            return
+        self.state.count("poll")
+        transcript = self.state.transcripts.get(self.path.rsplit("/", 1)[-1])
+        if transcript is None:
+            self._send_json(404, {"error": "Transcript not found"})
+        else:
+            self._send_json(200, self.state.transcript_view(transcript))
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        transcript = self.state.transcripts.pop(self.path.rsplit("/", 1)[-1], None)
+        self._send_json(200 if transcript else 404, {"id": self.path.rsplit("/", 1)[-1]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host="127.0.0.1", port=0, **state_options):
+    """Starts the mock API on a daemon thread; returns (server, base_url)."""
+    handler = type("BoundMockAssemblyAIHandler", (MockAssemblyAIHandler,), {"state": MockState(**state_options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-assemblyai", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def load_test(jobs, workers, file_kb, **state_options):
+    """Submits `jobs` transcriptions at once through the real JobEngine and reports latency."""
+    from transcription_jobs import AssemblyAIClient, JobEngine
+
+    server, base_url = start_mock_server(**state_options)
+    engine = JobEngine(AssemblyAIClient("mock-key", base_url=base_url), max_workers=workers)
+    payload = os.urandom(file_kb * 1024)
+
+    start = time.time()
+    submitted = []
+    for i in range(jobs):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
+            f.write(payload)
+        submitted.append(engine.submit(f.name, name=f"job-{i}"))
+    while engine.active_count():
+        time.sleep(0.2)
+    wall = time.time() - start
+
+    statuses = {}
+    for job in submitted:
+        statuses[job.status] = statuses.get(job.status, 0) + 1
+    latencies = [job.elapsed for job in submitted if job.status == "completed"]
+    print(f"{jobs} jobs, {workers} workers, {file_kb} KB each: {wall:.1f} s wall, {jobs / wall:.1f} jobs/s")
+    print(f"  statuses: {statuses}")
+    if latencies:
+        print(f"  latency p50 {percentile(latencies, 0.5):.1f} s, p95 {percentile(latencies, 0.95):.1f} s, "
+              f"mean {statistics.mean(latencies):.1f} s")
+    state = server.RequestHandlerClass.state
+    print(f"  API requests: {state.requests} ({state.requests['poll'] / max(jobs, 1):.1f} polls/job)")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock AssemblyAI API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--queue-seconds", type=float, default=0.5)
+    parser.add_argument("--base-seconds", type=float, default=1.0)
+    parser.add_argument("--seconds-per-audio-minute", type=float, default=2.0)
+    parser.add_argument("--bytes-per-minute", type=int, default=DEFAULT_BYTES_PER_MINUTE,
+                        help="upload size treated as one minute of audio")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--load-test", type=int, metavar="JOBS", help="run N concurrent jobs against the mock and exit")
+    parser.add_argument("--workers", type=int, default=64, help="job engine threads for --load-test")
+    parser.add_argument("--file-kb", type=int, default=256, help="upload size per job for --load-test")
+    args = parser.parse_args()
+
+    state_options = dict(queue_seconds=args.queue_seconds, base_seconds=args.base_seconds,
+                         seconds_per_audio_minute=args.seconds_per_audio_minute,
+                         bytes_per_minute=args.bytes_per_minute, error_rate=args.error_rate)
+    if args.load_test:
+        load_test(args.load_test, args.workers, args.file_kb, **state_options)
+        return
+
+    server, base_url = start_mock_server(args.host, args.port, **state_options)
+    print(f"Mock AssemblyAI listening on {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
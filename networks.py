@@ -1,177 +1,149 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
 import streamlit as st
 from pyvis.network import Network
 
-@st.cache_data
-def create_skills_network(role):
-    """Creates a skill network graph based on the selected role."""
-
-    if role == "Data Analyst":
-        skills_data = {
-            "nodes": [
-                {"id": "SQL", "group": "Databases"},
-                {"id": "Excel", "group": "Tools"},
-                {"id": "Data Visualization", "group": "Analysis"},
-                {"id": "Statistical Analysis", "group": "Analysis"},
-                {"id": "Business Intelligence", "group": "Business"}
-            ],
-            "edges": [
-                {"source": "SQL", "target": "Data Visualization", "label": "Data Insights"},
-                {"source": "Excel", "target": "Data Visualization", "label": "Reporting"},
-                {"source": "Statistical Analysis", "target": "Business Intelligence", "label": "Decision Making"},
-                {"source": "Data Visualization", "target": "Business Intelligence", "label": "Actionable Insights"}
-            ]
-        }
-    elif role == "Data Scientist":
-        skills_data = {
-            "nodes": [
-                {"id": "Python", "group": "Programming"},
-                {"id": "Machine Learning", "group": "AI/ML"},
-                {"id": "Deep Learning", "group": "AI/ML"},
-                {"id": "NLP", "group": "AI/ML"},
-                {"id": "Big Data", "group": "Data"}
-            ],
-            "edges": [
-                {"source": "Python", "target": "Machine Learning", "label": "Model Building"},
-                {"source": "Python", "target": "Deep Learning", "label": "Neural Networks"},
-                {"source": "Python", "target": "NLP", "label": "Text Analysis"},
-                {"source": "Machine Learning", "target": "Big Data", "label": "Scalability"},
-                {"source": "Deep Learning", "target": "Big Data", "label": "Large Datasets"}
-            ]
-        }
-    else:  # Python Developer
-        skills_data = {
-            "nodes": [
-                {"id": "Python", "group": "Programming"},
-                {"id": "Django", "group": "Frameworks"},
-                {"id": "Flask", "group": "Frameworks"},
-                {"id": "API Development", "group": "Backend"},
-                {"id": "Database Design", "group": "Databases"}
-            ],
-            "edges": [
-                {"source": "Python", "target": "Django", "label": "Web Apps"},
-                {"source": "Python", "target": "Flask", "label": "REST APIs"},
-                {"source": "Django", "target": "Database Design", "label": "Data Models"},
-                {"source": "Flask", "target": "API Development", "label": "Microservices"},
-                {"source": "API Development", "target": "Database Design", "label": "Data Persistence"}
-            ]
-        }
+from graph_layout import layout
+from graph_registry import registry
 
-    net = Network(height="600px", width="100%", notebook=True, heading=f"{role} Skill Network")
+# Graph datasets live in data/graphs/ and are loaded through the registry
+SKILL_GRAPH_NAMES = {
+    "Data Analyst": "skills_data_analyst",
+    "Data Scientist": "skills_data_scientist",
+    "Python Developer": "skills_python_developer",
+}
+PROJECT_GRAPH_NAME = "projects"
 
-    # Add nodes with groups
-    for node in skills_data["nodes"]:
-        net.add_node(node["id"], group=node["group"])
+# Bigger graphs are shown as one super-node per group until a group is expanded
+MAX_RENDERED_NODES = 200
 
-    # Add edges with labels
-    for edge in skills_data["edges"]:
-        net.add_edge(edge["source"], edge["target"], title=edge["label"])
-
-    # Configure interactivity options
-    net.set_options("""
-    {
-      "physics": {
-        "enabled": true,
+# Interactivity options shared by every graph
+NETWORK_OPTIONS = {
+    "physics": {
+        "enabled": True,
         "barnesHut": {
-          "gravitationalConstant": -2000,
-          "centralGravity": 0.3,
-          "springLength": 95,
-          "springConstant": 0.04,
-          "damping": 0.09
+            "gravitationalConstant": -2000,
+            "centralGravity": 0.3,
+            "springLength": 95,
+            "springConstant": 0.04,
+            "damping": 0.09
         },
         "maxVelocity": 50,
         "minVelocity": 0.1,
         "solver": "barnesHut",
         "timestep": 0.5
-      },
-      "nodes": {
+    },
+    "nodes": {
         "font": {
-          "size": 14
+            "size": 14
         }
-      },
-      "edges": {
+    },
+    "edges": {
         "smooth": {
-          "enabled": true,
-          "type": "dynamic"
+            "enabled": True,
+            "type": "dynamic"
         }
-      },
-      "interaction": {
-        "hover": true,
+    },
+    "interaction": {
+        "hover": True,
         "tooltipDelay": 200,
-        "navigationButtons": true
-      }
+        "navigationButtons": True
     }
-    """) 
+}
 
-    # Save and display the graph
-    net.save_graph("skills_network.html")
-    st.components.v1.html(open("skills_network.html", 'r').read(), height=650)
+# Positions are computed server-side, so the browser doesn't have to simulate
+STATIC_NETWORK_OPTIONS = {
+    **NETWORK_OPTIONS,
+    "physics": {"enabled": False},
+    "edges": {"smooth": {"enabled": True, "type": "continuous"}},
+}
 
-@st.cache_data
-def create_project_network():
-    """Creates a network graph of projects."""
-    # Define project data here
-    data = {
-        "nodes": [
-            {"id": "Project A", "group": "Data Science"},
-            {"id": "Project B", "group": "Web Dev"},
-            {"id": "Project C", "group": "Data Science"},
-            {"id": "Project D", "group": "Data Viz"},
-            {"id": "Project E", "group": "Web Dev"},
-        ],
-        "edges": [
-            {"source": "Project A", "target": "Project C", "label": "Shared Data"},
-            {"source": "Project B", "target": "Project E", "label": "Same Framework"},
-            {"source": "Project A", "target": "Project D", "label": "Visualization"},
-            {"source": "Project C", "target": "Project D", "label": "Visualization"},
-        ]
-    }
+# Opt-in "wiggle": physics on, but starting from the precomputed layout so it settles quickly
+WIGGLE_NETWORK_OPTIONS = {
+    **NETWORK_OPTIONS,
+    "physics": {**NETWORK_OPTIONS["physics"], "stabilization": {"enabled": False}},
+}
+
+# --- In-memory LRU render cache, keyed by a hash of the graph data ---
+# Filtered and expanded views are keyed by each visitor's choices, so only the most recent are kept
+MAX_CACHED_GRAPHS = 32
+_html_cache = OrderedDict()
+_html_cache_lock = threading.Lock()
 
-    net = Network(height="600px", width="100%", notebook=True, heading="Project Connections")
 
-    # Add nodes with groups
-    for node in data["nodes"]:
-        net.add_node(node["id"], group=node["group"])
+def graph_key(graph, options):
+    """Returns a stable hash of everything that affects the rendered HTML."""
+    payload = json.dumps({"graph": graph.digest, "heading": graph.heading, "options": options}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_network_html(graph, options):
+    """Builds the pyvis HTML for a graph in memory, without writing any files."""
+    net = Network(height="600px", width="100%", heading=graph.heading, cdn_resources="remote")
+
+    # Add nodes with groups at their precomputed positions
+    node_ids = [node["id"] for node in graph.nodes]
+    positions = layout(node_ids, [(e["source"], e["target"]) for e in graph.edges], graph.groups)
+    physics = options.get("physics", {}).get("enabled", True)
+    for node in graph.nodes:
+        x, y = positions[node["id"]]
+        extra = {"value": node["size"], "title": f"{node['size']} nodes"} if node.get("super") else {}
+        net.add_node(node["id"], label=node.get("label", node["id"]), group=node["group"],
+                     x=x, y=y, physics=physics, **extra)
 
     # Add edges with labels
-    for edge in data["edges"]:
-        net.add_edge(edge["source"], edge["target"], title=edge["label"])
-
-        # Configure interactivity options
-    net.set_options("""
-    {
-      "physics": {
-        "enabled": true,
-        "barnesHut": {
-          "gravitationalConstant": -2000,
-          "centralGravity": 0.3,
-          "springLength": 95,
-          "springConstant": 0.04,
-          "damping": 0.09
-        },
-        "maxVelocity": 50,
-        "minVelocity": 0.1,
-        "solver": "barnesHut",
-        "timestep": 0.5
-      },
-      "nodes": {
-        "font": {
-          "size": 14
-        }
-      },
-      "edges": {
-        "smooth": {
-          "enabled": true,
-          "type": "dynamic"
-        }
-      },
-      "interaction": {
-        "hover": true,
-        "tooltipDelay": 200,
-        "navigationButtons": true
-      }
-    }
-    """) 
-    # Save and display the graph
-    net.save_graph("project_network.html")
-    st.components.v1.html(open("project_network.html", 'r').read(), height=650)
-    
\ No newline at end of file
+    for edge in graph.edges:
+        extra = {"value": edge["weight"]} if "weight" in edge else {}
+        net.add_edge(edge["source"], edge["target"], title=edge.get("label", ""), **extra)
+
+    net.set_options(json.dumps(options))
+    return net.generate_html()
+
+
+def render_network_html(graph, options=STATIC_NETWORK_OPTIONS):
+    """Returns the graph's HTML, rendering it only if it isn't among the recently rendered graphs."""
+    key = graph_key(graph, options)
+    with _html_cache_lock:
+        html = _html_cache.get(key)
+        if html is not None:
+            _html_cache.move_to_end(key)
+            return html
+    html = build_network_html(graph, options)
+    with _html_cache_lock:
+        html = _html_cache.setdefault(key, html)
+        _html_cache.move_to_end(key)
+        while len(_html_cache) > MAX_CACHED_GRAPHS:
+            _html_cache.popitem(last=False)
+    return html
+
+
+def network_options(wiggle):
+    return WIGGLE_NETWORK_OPTIONS if wiggle else STATIC_NETWORK_OPTIONS
+
+
+def display_network(graph, key, wiggle=False):
+    """Renders a graph, aggregating groups into super-nodes when it's too large to draw."""
+    if len(graph) > MAX_RENDERED_NODES:
+        groups = sorted(set(graph.groups.tolist()))
+        col1, col2 = st.columns(2)
+        with col1:
+            selected = st.multiselect("Groups", groups, default=groups, key=f"{key}_groups")
+        with col2:
+            expanded = st.multiselect("Expand groups", selected, key=f"{key}_expand")
+        graph = graph.filter_groups(selected).aggregate(MAX_RENDERED_NODES, expand=expanded)
+        st.caption(f"Showing {len(graph)} nodes; collapsed groups are drawn as single super-nodes.")
+    st.components.v1.html(render_network_html(graph, network_options(wiggle)), height=650)
+
+
+def create_skills_network(role, wiggle=False):
+    """Creates a skill network graph based on the selected role."""
+    graph = registry.get(SKILL_GRAPH_NAMES.get(role, SKILL_GRAPH_NAMES["Python Developer"]))
+    display_network(graph, key="skills_network", wiggle=wiggle)
+
+
+def create_project_network(wiggle=False):
+    """Creates a network graph of projects."""
+    display_network(registry.get(PROJECT_GRAPH_NAME), key="project_network", wiggle=wiggle)
@@ -0,0 +1,112 @@
+"""Offline image optimizer.
+
+Writes resized WebP (and AVIF, when Pillow supports it) variants of every image
+the app references into `optimized/`, plus `optimized/manifest.json`, which
+`assets.py` reads at runtime to build srcsets and pick the smallest variant.
+
+Usage:
+    python optimize_images.py [--widths 320 640 960 1280 1920] [--quality 75]
+"""
+import argparse
+import glob
+import json
+import os
+
+from PIL import Image, features
+
+OPTIMIZED_DIR = "optimized"
+MANIFEST_PATH = os.path.join(OPTIMIZED_DIR, "manifest.json")
+DEFAULT_WIDTHS = [320, 640, 960, 1280, 1920]
+DEFAULT_QUALITY = 75
+
+# Every still image the app references (GIFs are handled by the media pipeline)
+REFERENCED_IMAGES = [
+    "data_analyst_bg.jpg",
+    "data_scientist_bg.jpg",
+    "python_developer_bg.jpg",
+    "images/linkedin_logo.png",
+    "images/github_logo.png",
+] + sorted(glob.glob("project_images/*.jpg"))
+
+
+def supported_formats():
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def variant_path(source, width, fmt):
+    stem = os.path.splitext(source)[0].replace("\\", "/")
+    return f"{OPTIMIZED_DIR}/{stem}-{width}w.{fmt}"
+
+
+def optimize_image(source, widths, formats, quality):
+    """Writes one variant per width/format, never upscaling past the original width."""
+    with Image.open(source) as img:
+        img.load()
+        original_width, original_height = img.size
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        targets = sorted({w for w in widths if w < original_width} | {original_width})
+        variants = []
+        for width in targets:
+            height = round(original_height * width / original_width)
+            resized = img if width == original_width else img.resize((width, height), Image.LANCZOS)
+            webp_bytes = None
+            for fmt in formats:
+                out_path = variant_path(source, width, fmt)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                options = {"quality": quality}
+                if fmt == "webp":
+                    options["method"] = 6
+                resized.save(out_path, format=fmt.upper(), **options)
+                size = os.path.getsize(out_path)
+                if fmt == "webp":
+                    webp_bytes = size
+                elif webp_bytes is not None and size >= webp_bytes:
+                    # Browsers prefer the AVIF source, so only keep it when it's actually smaller
+                    os.remove(out_path)
+                    continue
+                variants.append({
+                    "path": out_path,
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "bytes": size,
+                })
+
+    return {
+        "width": original_width,
+        "height": original_height,
+        "bytes": os.path.getsize(source),
+        "variants": variants,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF variants of the app's images.")
+    parser.add_argument("--widths", type=int, nargs="+", default=DEFAULT_WIDTHS)
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY)
+    args = parser.parse_args()
+
+    formats = supported_formats()
+    manifest = {}
+    for source in REFERENCED_IMAGES:
+        if not os.path.exists(source):
+            print(f"skip {source}: not found")
+            continue
+        entry = optimize_image(source, args.widths, formats, args.quality)
+        manifest[source.replace("\\", "/")] = entry
+        smallest = min(v["bytes"] for v in entry["variants"])
+        print(f"{source}: {entry['bytes'] / 1024:.0f} KB -> {len(entry['variants'])} variants, smallest {smallest / 1024:.0f} KB")
+
+    os.makedirs(OPTIMIZED_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Wrote {MANIFEST_PATH} ({len(manifest)} images, formats: {', '.join(formats)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Offline video/GIF transcoder.
+
+Turns the announcement video and the animated background GIF into short,
+muted, looping MP4 (H.264) and WebM (VP9) clips plus a JPEG poster frame, and
+records them in `optimized/media.json` for `media.py`. Requires ffmpeg on the
+PATH (or set FFMPEG=/path/to/ffmpeg).
+
+Usage:
+    python optimize_media.py [--max-width 960] [--max-seconds 12] [--fps 24]
+"""
+import argparse
+import json
+import os
+import subprocess
+
+OPTIMIZED_MEDIA_DIR = os.path.join("optimized", "media")
+MEDIA_MANIFEST_PATH = os.path.join("optimized", "media.json")
+FFMPEG = os.environ.get("FFMPEG", "ffmpeg")
+
+# Every video or animated GIF the app shows
+REFERENCED_MEDIA = [
+    "Independence day.mp4",
+    "background.gif",
+]
+
+
+def run_ffmpeg(args):
+    subprocess.run([FFMPEG, "-y", "-loglevel", "error", *args], check=True)
+
+
+def transcode(source, max_width, max_seconds, fps):
+    """Writes the MP4, WebM and poster for one source and returns its manifest entry."""
+    stem = os.path.splitext(os.path.basename(source))[0].replace(" ", "_").lower()
+    base = os.path.join(OPTIMIZED_MEDIA_DIR, stem)
+    scale = f"scale='min({max_width},iw)':-2,fps={fps}"
+    trim = ["-t", str(max_seconds)] if max_seconds else []
+
+    mp4_path = f"{base}.mp4"
+    run_ffmpeg(["-i", source, *trim, "-an", "-vf", scale, "-c:v", "libx264", "-preset", "slow",
+                "-crf", "28", "-pix_fmt", "yuv420p", "-movflags", "+faststart", mp4_path])
+
+    webm_path = f"{base}.webm"
+    run_ffmpeg(["-i", source, *trim, "-an", "-vf", scale, "-c:v", "libvpx-vp9", "-b:v", "0",
+                "-crf", "40", "-row-mt", "1", webm_path])
+
+    poster_path = f"{base}-poster.jpg"
+    run_ffmpeg(["-i", source, "-vf", f"scale='min({max_width},iw)':-2", "-frames:v", "1",
+                "-q:v", "5", poster_path])
+
+    # Smallest first: browsers play the first <source> they support
+    sources = [
+        {"path": webm_path.replace(os.sep, "/"), "type": "video/webm", "bytes": os.path.getsize(webm_path)},
+        {"path": mp4_path.replace(os.sep, "/"), "type": "video/mp4", "bytes": os.path.getsize(mp4_path)},
+    ]
+    sources.sort(key=lambda s: s["bytes"])
+    return {
+        "bytes": os.path.getsize(source),
+        "poster": poster_path.replace(os.sep, "/"),
+        "sources": sources,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcode videos and GIFs into small looping clips with posters.")
+    parser.add_argument("--max-width", type=int, default=960)
+    parser.add_argument("--max-seconds", type=int, default=12, help="0 keeps the full length")
+    parser.add_argument("--fps", type=int, default=24)
+    args = parser.parse_args()
+
+    os.makedirs(OPTIMIZED_MEDIA_DIR, exist_ok=True)
+    manifest = {}
+    for source in REFERENCED_MEDIA:
+        if not os.path.exists(source):
+            print(f"skip {source}: not found")
+            continue
+        entry = transcode(source, args.max_width, args.max_seconds, args.fps)
+        manifest[source] = entry
+        sizes = ", ".join(f"{s['type']} {s['bytes'] / 1024:.0f} KB" for s in entry["sources"])
+        print(f"{source}: {entry['bytes'] / 1024:.0f} KB -> {sizes}")
+
+    with open(MEDIA_MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Wrote {MEDIA_MANIFEST_PATH} ({len(manifest)} clips)")
+
+
+if __name__ == "__main__":
+    main()
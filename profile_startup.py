@@ -0,0 +1,77 @@
+"""Startup-time profiler.
+
+Imports the app and each lazily loaded page module in a fresh interpreter with
+`python -X importtime` and reports what they cost, so cold start and worker
+spawn time can be kept under budget.
+
+Usage:
+    python profile_startup.py [--top 15] [--budget-ms 1500]
+
+Exits with status 1 if importing `streamlit_app` takes longer than --budget-ms.
+"""
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+STARTUP_MODULE = "streamlit_app"
+PAGE_MODULES = ["networks", "chatbots", "analysis", "science"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_import(module, baseline=()):
+    """Imports `module` in a subprocess; returns (total_us, {top-level package: self_us}).
+
+    Modules in `baseline` are imported first and excluded from the numbers, to
+    measure what a page costs on top of an already-running app.
+    """
+    setup = "".join(f"import {name}; " for name in baseline)
+    code = f"{setup}import sys; sys.stderr.write('--start--\\n'); import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    stderr = result.stderr.split("--start--\n", 1)[-1]
+    by_package = defaultdict(int)
+    total = 0
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_time, cumulative, indent, name = match.groups()
+        # Attribute each module's own time to its top-level package, whoever imported it
+        by_package[name.split(".")[0]] += int(self_time)
+        if len(indent) == 1:
+            total += int(cumulative)
+    return total, dict(by_package)
+
+
+def print_breakdown(title, total, by_package, top):
+    print(f"\n{title}: {total / 1000:.0f} ms")
+    for name, micros in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import cost of the app.")
+    parser.add_argument("--top", type=int, default=15, help="packages to list per module")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if startup exceeds this")
+    args = parser.parse_args()
+
+    startup_total, startup_packages = profile_import(STARTUP_MODULE)
+    print_breakdown(f"Cold start ({STARTUP_MODULE})", startup_total, startup_packages, args.top)
+
+    for page in PAGE_MODULES:
+        total, packages = profile_import(page, baseline=[STARTUP_MODULE])
+        print_breakdown(f"First visit to {page} (on top of startup)", total, packages, args.top)
+
+    if args.budget_ms is not None and startup_total / 1000 > args.budget_ms:
+        print(f"\nStartup {startup_total / 1000:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,33 @@
 import os
-import time
-import tempfile
-import random
-import ast
-import base64
-import re
-import uuid
 
 # Third-party library imports
-import requests
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-from pydub import AudioSegment
-from fpdf import FPDF
-from moviepy.editor import *
-import PyPDF2 as pdf
-import yaml
-from pyvis.network import Network
 from streamlit_option_menu import option_menu
-from streamlit_lottie import st_lottie
-import google.generativeai as genai
 
 # Streamlit imports
 import streamlit as st
 
 # InBuilt Functions Import
-from chatbots import (thesis_writer_assistant, resume_ats_score_bot,
-                      code_explainer_bot, healerbeast_bff, qanda_bot,
-                      transcription_bot, chatbot)
 from utils import (load_lottieurl, display_lottie, display_pdf,local_css,
                    get_binary_file_downloader_html, show_announcement,show_video,
                    set_background, contact_section, display_resume_section)
 from charts import (create_chart, create_education_chart, display_work_experience,
                     create_skills_chart, create_project_impact_chart,
                     create_radar_chart, create_bar_chart, create_heatmap_chart)
-from networks import create_skills_network, create_project_network
+from animations import prefetch_in_background
+from assets import best_image, get_asset_registry, picture_html
+from lazy import lazy_import
+from media import video_background
 from projects import get_projects
 from skills import get_skills_data
-from analysis import data_analysis_page
-from science import data_science_page
+
+# Pages with heavy dependencies are imported the first time they're selected
+# (run `python profile_startup.py` to see what each one costs)
+chatbots = lazy_import("chatbots")  # google.generativeai, pydub, PyPDF2, fpdf
+networks = lazy_import("networks")  # pyvis
+analysis = lazy_import("analysis")  # sklearn, statsmodels, scipy
+science = lazy_import("science")  # sklearn, seaborn, matplotlib
 
 
 def display_home_section(role):
@@ -96,11 +83,11 @@ def display_home_section(role):
     col1, col2 = st.columns(2)
 
     with col1:
-        st.image("images/linkedin_logo.png", width=600)
+        st.image(best_image("images/linkedin_logo.png", 600), width=600)
         st.markdown("[LinkedIn Profile](https://www.linkedin.com/in/shahidnazeersyed/)")
 
     with col2:
-        st.image("images/github_logo.png", width=700)
+        st.image(best_image("images/github_logo.png", 700), width=700)
         st.markdown("[GitHub Profile](https://github.com/Syedshahidnazeer)")
 
 
@@ -126,7 +113,8 @@ def display_skills_section(role):
         st.markdown(f'<span class="skill-tag">{skill}</span>',
                     unsafe_allow_html=True)
 
-    create_skills_network(role)
+    wiggle = st.checkbox("Animate graph physics", value=False, key="skills_wiggle", disabled=is_mobile)
+    networks.create_skills_network(role, wiggle=wiggle)
 
 
 def display_projects_section(role):
@@ -178,7 +166,9 @@ def display_projects_section(role):
                 image_path = os.path.join("project_images", image_file)
 
                 if os.path.exists(image_path):
-                    st.image(image_path, use_column_width=True)
+                    # Column is a quarter of the page, so let the browser pick a small variant
+                    st.markdown(picture_html(image_path, alt=project, sizes="(max-width: 640px) 100vw, 25vw"),
+                                unsafe_allow_html=True)
                 else:
                     st.warning(f"Image not found: {image_path}")
 
@@ -205,7 +195,14 @@ def display_projects_section(role):
         image_file = f"{project.lower().replace(' ', '_')}.jpg"
         display_project_card(project, description, image_file) 
 
-    create_project_network()
+    wiggle = st.checkbox("Animate graph physics", value=False, key="projects_wiggle", disabled=is_mobile)
+    networks.create_project_network(wiggle=wiggle)
+@st.cache_resource
+def warm_animations():
+    """Prefetches every Lottie animation in the background, once per process."""
+    return prefetch_in_background()
+
+
 messages = [
     "Welcome to my Digital Realm!",
     "Explore my latest projects and skills!",
@@ -220,6 +217,9 @@ def main():
         layout="wide",
         initial_sidebar_state="collapsed"  # or "expanded"
     )
+    # Hash static assets and start the asset server (once per process)
+    get_asset_registry()
+    warm_animations()
     st.markdown(
         """
         <style>
@@ -327,16 +327,8 @@ def main():
             # ... (Your styles for the navigation menu) ...
         }
     )
-    # --- Function to encode video file to base64 ---
-    def encode_video(video_path):
-        with open(video_path, "rb") as video_file:
-            video_bytes = video_file.read()
-        return base64.b64encode(video_bytes).decode()
-    # --- Encode the video file ---
-    encoded_video = encode_video("Independence day.mp4")
-
-    # --- Display the video ---
-    show_video(encoded_video)
+    # --- Display the video (served by content-hash URL) ---
+    show_video("Independence day.mp4")
 
     show_announcement(messages)
 
@@ -351,11 +343,11 @@ def main():
         local_css("contacts.css")
         contact_section(role)
     elif selected == "Chat Bot":
-        chatbot()
+        chatbots.chatbot()
     elif selected == "Data Analysis":
-        data_analysis_page()
+        analysis.data_analysis_page()
     elif selected == "Data Science":
-        data_science_page()
+        science.data_science_page()
 
     # --- Footer ---
     st.markdown("---")
@@ -365,10 +357,11 @@ def main():
     with col2:
         background_type = st.selectbox("Choose background type", ["Static", "Dynamic"], key="background_select")
         if background_type == "Dynamic":
-            set_background("background.gif", is_gif=True)
+            # Poster first, then a small looping clip instead of the 1 MB GIF
+            video_background("background.gif")
 
 # Check if the user is on a mobile device
-is_mobile = st.query_params.get("mobile", ["false"])[0] == "true"
+is_mobile = st.query_params.get("mobile", "false") == "true"
 
 # Adjust layout based on device
 if is_mobile:
@@ -0,0 +1,227 @@
+"""JSON replies from an LLM, read leniently and checked against a schema.
+
+Asked for "ONLY valid JSON", Gemini still wraps the object in ```json fences,
+adds a sentence before or after it, leaves a trailing comma, or gets cut off
+mid-string. `parse` finds the object in a reply and repairs those slips
+locally. `Schema.read` checks the fields it needs, and `ask` re-asks only for
+the fields that are still missing or invalid, with a fixed budget of
+follow-ups. A value that is there but malformed is fixed by quoting the reply
+back; a missing or empty one needs the original request (and its source
+text) again.
+"""
+import ast
+import json
+import re
+
+MAX_FOLLOW_UPS = 2
+FOLLOW_UP_REPLY_CHARS = 4000  # previous reply quoted back in a follow-up
+# Reasons a field has no value at all; re-asking for it needs the source text, not just the reply
+MISSING = "missing"
+NO_JSON = "no JSON object found"
+EMPTY = "is empty"
+NEEDS_SOURCE = {MISSING, NO_JSON, EMPTY}
+MAX_CANDIDATES = 20  # '{' positions tried in one reply
+
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+
+decoder = json.JSONDecoder(strict=False)  # allows raw newlines inside strings
+
+
+class StructuredOutputError(ValueError):
+    """The reply (and any follow-ups) didn't contain valid values for every required field."""
+
+    def __init__(self, problems, values=None):
+        super().__init__("; ".join(f"{name}: {reason}" for name, reason in problems.items()))
+        self.problems = problems
+        self.values = values or {}
+
+
+def close_truncated(text):
+    """Closes an unterminated string and any open brackets, for replies cut off mid-object."""
+    closers, in_string, escaped = [], False, False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+    if escaped:
+        text = text[:-1]
+    return text + ('"' if in_string else "") + "".join(reversed(closers))
+
+
+def _decode(text):
+    """The first JSON object that decodes from a '{' in `text`, or None."""
+    start = text.find("{")
+    for _ in range(MAX_CANDIDATES):
+        if start < 0:
+            return None
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+
+def parse(reply):
+    """Returns the JSON object in an LLM reply, or None.
+
+    Tries the reply as is (prose and fences are skipped over), then with
+    trailing commas removed and curly quotes straightened, then as a
+    Python-style dict, and finally with a truncated ending closed.
+    """
+    if not reply:
+        return None
+    value = _decode(reply)
+    if value is not None:
+        return value
+    start = reply.find("{")
+    if start < 0:
+        return None
+    end = reply.rfind("}")
+    body = reply[start:end + 1] if end > start else reply[start:]
+    body = TRAILING_COMMA.sub(r"\1", body.translate(SMART_QUOTES))
+    value = _decode(body)
+    if value is not None:
+        return value
+    try:
+        value = ast.literal_eval(body)  # {'key': 'value', 'flag': True}
+        if isinstance(value, dict):
+            return value
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    return _decode(close_truncated(reply[start:]))
+
+
+def _key(name):
+    return re.sub(r"[\s_-]+", "", str(name)).lower()
+
+
+class Field:
+    """One expected field: a name, a type (str, list, int or float) and what it should contain."""
+
+    def __init__(self, name, kind=str, description="", required=True):
+        self.name = name
+        self.kind = kind
+        self.description = description
+        self.required = required
+
+    def coerce(self, value):
+        """Returns the value as `kind`, or raises ValueError saying what's wrong with it."""
+        if self.kind is str:
+            if value is None or (isinstance(value, str) and not value.strip()):
+                raise ValueError(EMPTY)
+            if isinstance(value, (dict, list)):
+                raise ValueError("should be a string")
+            return str(value).strip()
+        if self.kind is list:
+            if isinstance(value, str):
+                value = [part.strip() for part in value.split(",") if part.strip()]
+            if not isinstance(value, list):
+                raise ValueError("should be a list")
+            return value
+        if self.kind in (int, float):
+            if isinstance(value, str):
+                value = value.strip().rstrip("%")
+            try:
+                return self.kind(float(value)) if self.kind is int else float(value)
+            except (TypeError, ValueError):
+                raise ValueError("should be a number") from None
+        return value
+
+    def example(self):
+        return {str: "...", list: ["..."], int: 0, float: 0.0}.get(self.kind, "...")
+
+
+class Schema:
+    """The fields a structured reply must contain."""
+
+    def __init__(self, fields):
+        self.fields = {field.name: field for field in fields}
+
+    def labelled(self, reply, names):
+        """String fields written as `Name: value` lines instead of JSON."""
+        found = {}
+        for name in names:
+            if self.fields[name].kind is not str:
+                continue
+            match = re.search(rf'(?im)^[\s*#>"-]*{re.escape(name)}[\s*"]*:\s*(.+(?:\n(?!\s*\n).+)*)', reply)
+            if match:
+                found[name] = match.group(1).strip().strip('*"').strip()
+        return found
+
+    def read(self, reply, names=None):
+        """Returns (values, problems) for the fields `names` (default: all) in an LLM reply.
+
+        `problems` maps each required field that is missing or invalid to
+        the reason. Keys are matched ignoring case, spaces and underscores.
+        """
+        names = list(names or self.fields)
+        data = parse(reply)
+        if data is None:
+            data = self.labelled(reply or "", names)
+        by_key = {_key(key): value for key, value in data.items()}
+        values, problems = {}, {}
+        for name in names:
+            field = self.fields[name]
+            if _key(name) not in by_key:
+                if field.required:
+                    problems[name] = MISSING if data else NO_JSON
+                continue
+            try:
+                values[name] = field.coerce(by_key[_key(name)])
+            except ValueError as e:
+                if field.required:
+                    problems[name] = str(e)
+        return values, problems
+
+    def template(self, names=None):
+        """A JSON example object with just the fields `names`."""
+        return json.dumps({name: self.fields[name].example() for name in names or self.fields})
+
+    def follow_up(self, prompt, reply, problems):
+        """A prompt asking again for only the fields in `problems`.
+
+        If every failed field has a value in the wrong shape, the reply is
+        quoted back to be reformatted. Otherwise the original prompt is sent
+        again, since a missing value can only come from the source text.
+        """
+        wanted = "\n".join(f"- {name}: {reason}. {self.fields[name].description}".rstrip()
+                           for name, reason in problems.items())
+        instruction = (f"Reply with ONLY this JSON object, with no markdown fences or other text:\n"
+                       f"{self.template(problems)}")
+        if reply and not NEEDS_SOURCE & set(problems.values()):
+            return (f"Your previous answer was:\n{reply[:FOLLOW_UP_REPLY_CHARS]}\n\n"
+                    f"These fields were invalid:\n{wanted}\n\n{instruction}")
+        return f"{prompt}\n\nThese fields are needed:\n{wanted}\n\n{instruction}"
+
+
+def ask(generate, prompt, schema, max_follow_ups=MAX_FOLLOW_UPS):
+    """Returns the schema's values from `generate(prompt)`, re-asking only for failed fields.
+
+    Raises StructuredOutputError, carrying whatever was read, if required
+    fields are still missing after `max_follow_ups` follow-ups.
+    """
+    reply = generate(prompt)
+    values, problems = schema.read(reply)
+    for _ in range(max_follow_ups):
+        if not problems:
+            break
+        reply = generate(schema.follow_up(prompt, reply, problems))
+        more, problems = schema.read(reply, problems)
+        values.update(more)
+    if problems:
+        raise StructuredOutputError(problems, values)
+    return values
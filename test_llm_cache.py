@@ -0,0 +1,46 @@
+import pytest
+
+import chatbots
+from chat_history import ChatHistory
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(path=str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(chatbots, "get_llm_cache", lambda: cache)
+    return cache
+
+
+def ask(monkeypatch, history, user_input, answer):
+    """One Q&A turn through the same calls qanda_bot makes; returns the cached answer, if any."""
+    called = []
+
+    def stream(prompt, **kwargs):
+        called.append(prompt)
+        yield answer
+
+    monkeypatch.setattr(chatbots.gemini, "stream", stream)
+    prompt, query = chatbots.turn_prompt(history, user_input, f"Your Prompt for Q&A Bot using {user_input}")
+    chatbots.add_user_message(history, user_input)
+    reply = chatbots.stream_assistant_message(history, prompt, bot="qanda", query=query)
+    return None if called else reply
+
+
+PARIS = ("Paris is the capital and largest city of France, on the Seine. It is known for its art, "
+         "fashion, food and culture, and it has been a major centre of finance and diplomacy for centuries. ") * 5
+
+
+def test_later_turns_only_match_exactly(cache, monkeypatch):
+    # The long first answer dominates every later prompt, so whole prompts look alike
+    history = ChatHistory()
+    assert ask(monkeypatch, history, "Tell me about Paris", PARIS) is None
+    assert ask(monkeypatch, history, "Tell me more about its population", "ANSWER 1") is None
+    assert ask(monkeypatch, history, "And what about its main museums?", "ANSWER 2") is None
+    assert ask(monkeypatch, history, "And its main parks?", "ANSWER 3") is None
+    assert cache.stats()["qanda"]["similar_hits"] == 0
+
+
+def test_first_turn_matches_similar_question(cache, monkeypatch):
+    assert ask(monkeypatch, ChatHistory(), "What is the capital of France?", "Paris") is None
+    assert ask(monkeypatch, ChatHistory(), "what is the capital of France", "unused") == "Paris"
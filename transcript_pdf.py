@@ -0,0 +1,123 @@
+"""Transcript PDF export.
+
+The PDF is rendered only when someone clicks download. It is written
+straight to a file in the transcript store and served from there afterwards,
+named by a hash of the transcript text (and `FORMAT_VERSION`). Text is set in
+DejaVu Sans, a Unicode TrueType font, so accents, Cyrillic, Greek and curly
+quotes come out as written rather than crashing a latin-1 encode. The font is
+found via `PORTFOLIO_PDF_FONT`, the system fonts or the copy bundled with
+matplotlib. If none is found, the built-in Arial is used with unsupported
+characters replaced by "?".
+
+Long transcripts are split into paragraphs of at most `PARAGRAPH_CHARS` at
+sentence ends before layout. fpdf keeps every page's content stream in memory
+until it writes the file, so peak memory grows with the transcript, at a few
+times its size (about 4 MB for a ten-hour, 130-page transcript, on top of
+the 30 MB or so of parsed font metrics).
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from lazy import lazy_import
+
+fpdf = lazy_import("fpdf")
+
+FORMAT_VERSION = 2  # bump to stop serving PDFs rendered by an older layout
+FONT_PATH = os.environ.get("PORTFOLIO_PDF_FONT")
+SYSTEM_FONTS = ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/Library/Fonts/DejaVuSans.ttf"]
+FONT_CACHE_DIR = os.path.join(".cache", "fonts")  # fpdf's parsed font metrics
+FONT_SIZE = 11
+LINE_HEIGHT = 6
+PARAGRAPH_CHARS = 1500
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+_font_lock = threading.Lock()
+
+
+def find_font():
+    """Path of a Unicode TTF to embed, or None."""
+    candidates = [FONT_PATH] + SYSTEM_FONTS
+    try:
+        import matplotlib
+        candidates.append(os.path.join(matplotlib.get_data_path(), "fonts", "ttf", "DejaVuSans.ttf"))
+    except ImportError:
+        pass
+    return next((path for path in candidates if path and os.path.exists(path)), None)
+
+
+def file_name(text):
+    """Store file name for the PDF of `text`; changes whenever the text or the layout does."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\0{text}".encode()).hexdigest()
+    return f"transcript-{digest[:16]}.pdf"
+
+
+def paragraphs(text, max_chars=PARAGRAPH_CHARS):
+    """Yields the transcript's paragraphs, breaking long ones at sentence ends near `max_chars`."""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        piece = ""
+        for sentence in SENTENCE_END.split(paragraph):
+            if piece and len(piece) + len(sentence) >= max_chars:
+                yield piece
+                piece = ""
+            piece = f"{piece} {sentence}" if piece else sentence
+        if piece:
+            yield piece
+
+
+def compact_subset(pdf):
+    """Drops repeated characters from fpdf 1.7's list of glyphs to embed.
+
+    fpdf 1.7 appends every character it draws to that list. The list then
+    grows with the text, and the font width table scans it once per code
+    point, which took most of a minute for a ten-hour transcript. Kept
+    unique, it stays as small as the character set.
+    """
+    font = pdf.current_font
+    subset = font.get("subset") if isinstance(font, dict) else None
+    if isinstance(subset, list):
+        subset[:] = sorted(set(subset))
+
+
+def write_pdf(text, path, title="Transcript"):
+    """Lays out `text` and writes the PDF to `path`."""
+    pdf = fpdf.FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    font = find_font()
+    if font:
+        with _font_lock:
+            # fpdf caches parsed metrics next to the font by default, which may be read-only
+            if hasattr(fpdf, "set_global"):
+                os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+                fpdf.set_global("FPDF_CACHE_MODE", 2)
+                fpdf.set_global("FPDF_CACHE_DIR", FONT_CACHE_DIR)
+            pdf.add_font("DejaVu", "", font, uni=True)
+        family = "DejaVu"
+    else:
+        family = "Arial"
+        text = text.encode("latin-1", "replace").decode("latin-1")
+        title = title.encode("latin-1", "replace").decode("latin-1")
+    pdf.add_page()
+    pdf.set_font(family, size=FONT_SIZE + 5)
+    pdf.cell(0, LINE_HEIGHT * 2, title, ln=1)
+    pdf.set_font(family, size=FONT_SIZE)
+    for paragraph in paragraphs(text):
+        pdf.multi_cell(0, LINE_HEIGHT, paragraph)
+        pdf.ln(LINE_HEIGHT / 2)
+        compact_subset(pdf)
+    pdf.output(path, "F")
+
+
+def render_bytes(text):
+    """The PDF of `text` as bytes, for transcripts that have no store entry to cache it in."""
+    handle, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(handle)
+    try:
+        write_pdf(text, path)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
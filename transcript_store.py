@@ -0,0 +1,121 @@
+"""Transcripts kept on disk by the SHA-256 of the media they came from.
+
+Each entry is a directory under `.cache/transcripts/<digest>/` holding
+`transcript.json` (text, summary and word timings) and, once someone has
+downloaded it, the transcript PDF (see `transcript_pdf`). Entries survive
+restarts and are shared by every session. When the store grows past its byte
+budget, the least recently used entries are deleted.
+"""
+import json
+import os
+import shutil
+import threading
+
+STORE_DIR = os.path.join(".cache", "transcripts")
+MAX_BYTES = int(os.environ.get("PORTFOLIO_TRANSCRIPT_CACHE_BYTES", str(512 * 1024 * 1024)))
+TRANSCRIPT_FILE = "transcript.json"
+
+
+class TranscriptStore:
+    """Size-bounded, least-recently-used transcript cache on disk."""
+
+    def __init__(self, root=STORE_DIR, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path_for(self, digest, name=TRANSCRIPT_FILE):
+        return os.path.join(self.root, digest, name)
+
+    def get(self, digest):
+        """Returns {"transcript", "summary", "words"} for known media, or None."""
+        path = self.path_for(digest)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._touch(digest)
+        return entry
+
+    def put(self, digest, transcript, summary=None, words=None):
+        self._write(digest, TRANSCRIPT_FILE, json.dumps(
+            {"transcript": transcript, "summary": summary, "words": words}).encode())
+        self.evict()
+
+    def get_file(self, digest, name, render):
+        """Returns the bytes of file `name` in the entry, calling `render(path)` to write it the first time.
+
+        Returns None if there is no entry for `digest` to keep it in. The
+        bytes are read before eviction runs, so a store over budget can
+        drop the entry without failing the caller.
+        """
+        if not digest or not os.path.isdir(os.path.join(self.root, digest)):
+            return None
+        path = self.path_for(digest, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            self._touch(digest)
+            return data
+        except OSError:
+            pass
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            render(tmp_path)
+            with open(tmp_path, "rb") as f:
+                data = f.read()
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._touch(digest)
+        self.evict()
+        return data
+
+    def _write(self, digest, name, data):
+        directory = os.path.join(self.root, digest)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _touch(self, digest):
+        try:
+            os.utime(os.path.join(self.root, digest))
+        except OSError:
+            pass
+
+    def entries(self):
+        """Returns [(last_used, bytes, digest), ...] for every entry on disk."""
+        result = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return result
+        for digest in names:
+            directory = os.path.join(self.root, digest)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+                result.append((os.path.getmtime(directory), size, digest))
+            except OSError:
+                continue
+        return result
+
+    def evict(self):
+        """Deletes least recently used entries until the store fits in `max_bytes`."""
+        with self._lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, digest in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(os.path.join(self.root, digest), ignore_errors=True)
+                total -= size
+
+    def stats(self):
+        entries = self.entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes}
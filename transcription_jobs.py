@@ -0,0 +1,464 @@
+import hashlib
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from audio_segments import FFMPEG, SEARCH_SECONDS, SEGMENT_SECONDS, ffmpeg_available, plan_segments
+
+ASSEMBLYAI_BASE_URL = os.environ.get("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com").rstrip("/")
+MAX_WORKERS = int(os.environ.get("PORTFOLIO_TRANSCRIPTION_WORKERS", "8"))
+SEGMENT_WORKERS = int(os.environ.get("PORTFOLIO_SEGMENT_WORKERS", "4"))  # segments in flight across all jobs
+JOB_RETENTION = 60 * 60  # seconds a finished job stays visible
+UPLOAD_URL_TTL = 12 * 60 * 60  # AssemblyAI upload URLs are only valid for a limited time
+MAX_CACHED_UPLOADS = 256  # upload URLs remembered, by media content hash
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+CHUNK_SIZE = 1024 * 1024  # bytes read, hashed and uploaded at a time
+
+QUEUED = "queued"
+CONVERTING = "converting"
+UPLOADING = "uploading"
+TRANSCRIBING = "transcribing"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class TranscriptionError(Exception):
+    pass
+
+
+class PollSchedule:
+    """Exponential poll delays with jitter, reset whenever the remote status changes.
+
+    A freshly queued transcript is checked after ~1 s, then less and less often
+    (up to `maximum`), so hundreds of long jobs don't hammer the API while short
+    ones still finish promptly.
+    """
+
+    def __init__(self, initial=1.0, factor=1.6, maximum=15.0, jitter=0.2):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+        self.delay = initial
+        self.status = None
+
+    def next_delay(self, status):
+        if status != self.status:
+            self.status = status
+            self.delay = self.initial
+        delay = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.delay = min(self.delay * self.factor, self.maximum)
+        return delay
+
+
+class AssemblyAIClient:
+    """Thin AssemblyAI REST client sharing one pooled session."""
+
+    def __init__(self, api_key, base_url=ASSEMBLYAI_BASE_URL, timeout=(5, 60)):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(MAX_WORKERS, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def headers(self):
+        return {"authorization": self.api_key}
+
+    def upload(self, data):
+        """Uploads a local file path, or an iterable of byte chunks, and returns its `upload_url`.
+
+        Chunks are sent with chunked transfer encoding as they're produced, so
+        memory use doesn't grow with the size of the media.
+        """
+        if isinstance(data, str):
+            with open(data, "rb") as f:
+                return self._post_upload(f)
+        return self._post_upload(data)
+
+    def _post_upload(self, body):
+        response = self.session.post(f"{self.base_url}/v2/upload", headers=self.headers,
+                                     data=body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["upload_url"]
+
+    def create_transcript(self, audio_url, **options):
+        response = self.session.post(f"{self.base_url}/v2/transcript", headers=self.headers,
+                                     json={"audio_url": audio_url, **options}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def get_transcript(self, transcript_id):
+        response = self.session.get(f"{self.base_url}/v2/transcript/{transcript_id}",
+                                    headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def wait_for_transcript(self, transcript_id, cancel_event, schedule=None, on_poll=None):
+        """Polls until the transcript completes; raises JobCancelled as soon as `cancel_event` is set."""
+        schedule = schedule or PollSchedule()
+        while True:
+            result = self.get_transcript(transcript_id)
+            status = result["status"]
+            if on_poll:
+                on_poll(result)
+            if status == "completed":
+                return result
+            if status == "error":
+                raise TranscriptionError(result.get("error", "Unknown error"))
+            if cancel_event.wait(schedule.next_delay(status)):
+                raise JobCancelled()
+
+
+def file_digest(file_path, chunk_size=CHUNK_SIZE):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_upload(uploaded_file, suffix="", chunk_size=CHUNK_SIZE):
+    """Copies a file-like upload to a named temp file in chunks; returns (path, sha256 hex digest)."""
+    uploaded_file.seek(0)
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        for chunk in iter(lambda: uploaded_file.read(chunk_size), b""):
+            digest.update(chunk)
+            temp_file.write(chunk)
+    return temp_file.name, digest.hexdigest()
+
+
+class UploadCache:
+    """Maps media content hashes to AssemblyAI upload URLs, for at most `max_entries` files.
+
+    Concurrent jobs for the same content wait on one upload instead of each
+    sending the file. URLs older than `ttl` are dropped, as AssemblyAI no
+    longer serves them.
+    """
+
+    def __init__(self, ttl=UPLOAD_URL_TTL, max_entries=MAX_CACHED_UPLOADS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._urls = OrderedDict()
+        self._key_locks = {}  # digest -> [lock, jobs using it]; removed once no job holds it
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._urls.get(digest)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl:
+                del self._urls[digest]
+                return None
+            return entry[1]
+
+    def _put(self, digest, url):
+        with self._lock:
+            self._urls[digest] = (time.time(), url)
+            self._urls.move_to_end(digest)
+            # Insertion order is age order, so expired and excess entries are at the front
+            while self._urls and (len(self._urls) > self.max_entries
+                                  or time.time() - next(iter(self._urls.values()))[0] >= self.ttl):
+                self._urls.popitem(last=False)
+
+    def get_or_upload(self, digest, upload):
+        """Returns (upload_url, cached); calls `upload()` only when there's no fresh URL."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(digest, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                url = self.get(digest)
+                if url:
+                    return url, True
+                url = upload()
+                self._put(digest, url)
+                return url, False
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._key_locks[digest]
+
+
+def stream_audio(file_path, cancel_event, start=None, duration=None, chunk_size=CHUNK_SIZE):
+    """Yields MP3 chunks of a file's audio track (or of `duration` seconds from `start`) as ffmpeg encodes them.
+
+    ffmpeg reads the media from disk and writes mono 16 kHz MP3 to a pipe, so
+    only one chunk is held in memory at a time. Stops ffmpeg if the generator
+    is closed early or the job is cancelled.
+    """
+    seek = ["-ss", f"{start:.3f}"] if start else []
+    limit = ["-t", f"{duration:.3f}"] if duration else []
+    if file_path.lower().endswith(".mp3"):
+        codec = ["-c:a", "copy"]  # cutting an MP3 needs no re-encode
+    else:
+        codec = ["-ac", "1", "-ar", "16000", "-b:a", "64k"]
+    # stderr goes to a file: an unread pipe can fill up on noisy input and stall ffmpeg for good
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [FFMPEG, "-nostdin", "-loglevel", "error", *seek, "-i", file_path, *limit, "-vn", *codec,
+         "-f", "mp3", "pipe:1"],
+        stdout=subprocess.PIPE, stderr=stderr,
+    )
+    try:
+        for chunk in iter(lambda: process.stdout.read(chunk_size), b""):
+            if cancel_event.is_set():
+                raise JobCancelled()
+            yield chunk
+        if process.wait() != 0:
+            stderr.seek(0)
+            raise TranscriptionError(f"ffmpeg failed: {stderr.read().decode(errors='replace')[-500:]}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr.close()
+
+
+class TranscriptionJob:
+    """State of one transcription, updated by a worker thread and read by the UI."""
+
+    def __init__(self, file_path, name, cleanup=True, parallel=False, digest=None):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.digest = digest
+        self.name = name
+        self.cleanup = cleanup
+        self.parallel = parallel
+        self.segments = []
+        self.status = QUEUED
+        self.detail = "Waiting for a worker"
+        self.transcript = None
+        self.summary = None
+        self.words = None
+        self.cached = False
+        self.error = None
+        self.polls = 0
+        self.created_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.temp_paths = [file_path] if cleanup else []
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.created_at
+
+    def update(self, status, detail=""):
+        if self.cancel_event.is_set() and status not in FINISHED:
+            raise JobCancelled()
+        self.status = status
+        self.detail = detail
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class JobEngine:
+    """Runs transcription jobs on a bounded thread pool, outside the Streamlit script thread."""
+
+    def __init__(self, client, max_workers=MAX_WORKERS, uploads=None, segment_workers=SEGMENT_WORKERS,
+                 segment_seconds=SEGMENT_SECONDS, store=None):
+        if segment_seconds <= 2 * SEARCH_SECONDS:
+            # plan_segments would reject it on every job, quietly turning parallel mode off
+            raise ValueError(f"segment_seconds must be more than {2 * SEARCH_SECONDS}, got {segment_seconds}")
+        self.client = client
+        self.uploads = uploads or UploadCache()
+        self.store = store
+        self.segment_seconds = segment_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcription")
+        self._segment_executor = ThreadPoolExecutor(max_workers=segment_workers, thread_name_prefix="segment")
+
+    def submit(self, file_path, name=None, cleanup=True, parallel=False, digest=None):
+        """Queues a file for transcription and returns its job immediately.
+
+        With `parallel`, recordings longer than 1.5 segments are split at
+        silences and the segments are transcribed concurrently. If `digest`
+        (the file's SHA-256) is already in the transcript store, the job is
+        completed on the spot without any remote calls.
+        """
+        job = TranscriptionJob(file_path, name or os.path.basename(file_path), cleanup=cleanup,
+                               parallel=parallel, digest=digest)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        if digest and self.load_stored(job):
+            self._finish(job, COMPLETED, "Loaded from the transcript cache")
+        else:
+            self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job:
+            job.cancel()
+
+    def active_count(self):
+        return sum(1 for job in list(self._jobs.values()) if not job.done)
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION
+        for job_id in [i for i, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        try:
+            self.process(job)
+            status, detail = COMPLETED, "Done"
+        except JobCancelled:
+            status, detail = CANCELLED, "Cancelled"
+        except Exception as e:
+            job.error = str(e)
+            status, detail = FAILED, str(e)
+        self._finish(job, status, detail)
+
+    def _finish(self, job, status, detail):
+        for path in job.temp_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        job.finished_at = time.time()
+        job.update(status, detail)
+
+    def load_stored(self, job):
+        """Fills in the job from the transcript store; returns True on a hit."""
+        entry = self.store.get(job.digest) if self.store else None
+        if entry is None:
+            return False
+        job.transcript, job.summary, job.words = entry["transcript"], entry["summary"], entry["words"]
+        job.cached = True
+        return True
+
+    def save_stored(self, job):
+        if self.store:
+            self.store.put(job.digest, job.transcript, job.summary, job.words)
+
+    def on_poll(self, job):
+        def count_poll(result):
+            job.polls += 1
+            if not job.segments:
+                job.detail = f"Remote status: {result['status']}"
+        return count_poll
+
+    def transcribe(self, job, audio_url):
+        """Runs one transcript job with summarization and waits for it."""
+        transcript_id = self.client.create_transcript(audio_url, summarization=True,
+                                                      summary_model="informative", summary_type="bullets")
+        return self.client.wait_for_transcript(transcript_id, job.cancel_event, on_poll=self.on_poll(job))
+
+    def process(self, job):
+        """Uploads the media once (or reuses the URL for identical content) and runs a single
+        transcript job that returns both the text and the summary, or one per segment in parallel mode."""
+        if not job.digest:
+            job.update(UPLOADING, "Hashing")
+            job.digest = file_digest(job.file_path)
+            if self.load_stored(job):
+                job.detail = "Loaded from the transcript cache"
+                return
+        digest = job.digest
+
+        if job.parallel and ffmpeg_available():
+            job.update(CONVERTING, "Finding silences to split on")
+            try:
+                segments = plan_segments(job.file_path, self.segment_seconds)
+            except (OSError, ValueError, subprocess.CalledProcessError):
+                # ffmpeg missing or unable to read the file: a single upload still works for mp3
+                segments = []
+            if len(segments) > 1:
+                return self.process_segments(job, digest, segments)
+
+        def upload():
+            if job.file_path.lower().endswith(VIDEO_EXTENSIONS):
+                job.update(CONVERTING, "Extracting and uploading audio")
+                return self.client.upload(stream_audio(job.file_path, job.cancel_event))
+            job.update(UPLOADING, "Uploading")
+            return self.client.upload(job.file_path)
+
+        audio_url, cached = self.uploads.get_or_upload(digest, upload)
+
+        job.update(TRANSCRIBING, "Transcribing (reusing earlier upload)" if cached else "Transcribing")
+        result = self.transcribe(job, audio_url)
+        job.transcript = result["text"]
+        job.summary = result.get("summary")
+        job.words = result.get("words")
+        self.save_stored(job)
+
+    def process_segments(self, job, digest, segments):
+        """Transcribes segments concurrently and stitches them back together in order."""
+        job.segments = [{"index": i, "start": start, "end": end, "status": QUEUED}
+                        for i, (start, end) in enumerate(segments)]
+        job.update(TRANSCRIBING, f"0/{len(segments)} segments transcribed")
+        futures = [self._segment_executor.submit(self.transcribe_segment, job, digest, segment)
+                   for segment in job.segments]
+        try:
+            results = [future.result() for future in futures]
+        except BaseException:
+            # Stop the remaining segments before reporting the first failure
+            job.cancel_event.set()
+            for future in futures:
+                future.cancel()
+            raise
+
+        job.transcript = " ".join(text for text, _, _ in results if text)
+        job.summary = "\n".join(summary for _, summary, _ in results if summary) or None
+        job.words = [word for _, _, words in results for word in words]
+        self.save_stored(job)
+
+    def transcribe_segment(self, job, digest, segment):
+        """Uploads and transcribes one segment; returns (text, summary, words) with word times offset."""
+        if job.cancel_event.is_set():
+            raise JobCancelled()
+        start, end = segment["start"], segment["end"]
+        segment["status"] = UPLOADING
+        audio_url, _ = self.uploads.get_or_upload(
+            f"{digest}:{start:.3f}-{end:.3f}",
+            lambda: self.client.upload(stream_audio(job.file_path, job.cancel_event, start, end - start)),
+        )
+        segment["status"] = TRANSCRIBING
+        try:
+            result = self.transcribe(job, audio_url)
+        except JobCancelled:
+            segment["status"] = CANCELLED
+            raise
+        except Exception:
+            segment["status"] = FAILED
+            raise
+        segment["status"] = COMPLETED
+        done = sum(1 for s in job.segments if s["status"] == COMPLETED)
+        job.detail = f"{done}/{len(job.segments)} segments transcribed"
+
+        offset = int(start * 1000)
+        words = [dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                 for word in result.get("words") or []]
+        return result["text"], result.get("summary"), words
@@ -1,26 +1,20 @@
-import requests
 from streamlit_lottie import st_lottie
 import streamlit as st
 import uuid
-import base64
-from fpdf import FPDF
 import os
 import pandas as pd
 from io import BytesIO
 from datetime import datetime
 from itertools import cycle
 import json
+from animations import ANIMATIONS, load_animation
+from assets import asset_url, background_css
+from encoders import encode_bytes, encode_file
+from media import lazy_video
 
-@st.cache_data
 def load_lottieurl(url: str):
-    """Loads a Lottie animation from a URL."""
-    try:
-        r = requests.get(url)
-        r.raise_for_status()
-        return r.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error loading Lottie animation from {url}: {e}")
-        return None
+    """Loads a Lottie animation from a URL (cached; never blocks on the network)."""
+    return load_animation(url)
 
 def display_lottie(url, height=200, key=None):
     """Displays a Lottie animation."""
@@ -34,63 +28,24 @@ def local_css(file_name):
     with open(file_name) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
-def show_video(video_file):
-    """Displays a video."""
-    st.markdown(f"""
-    <div class="announcement-wrapper">
-        <div class="announcement-video-container">
-            <video autoplay muted loop class="announcement-video">
-                <source src="data:video/mp4;base64,{video_file}" type="video/mp4">
-            </video>
-        </div>
-    </div>
+def show_video(video_path, height=200):
+    """Displays a video as a lazily loaded, muted loop with a poster frame."""
+    lazy_video(video_path, height=height)
+
 
-    <style>
-    .announcement-wrapper {{
-        display: flex;
-        flex-direction: column; /* Stack video on top of message */
-        padding: 10px; /* Reduced padding */
-        margin: 10px 0; /* Reduced margin */
-        border-radius: 10px;
-        animation: slide-in 1s ease-out;
-    }}
-    .announcement-video-container {{
-        border-radius: 10px 10px 0 0; /* Rounded top corners */
-    }}
-    .announcement-video {{
-        width: 100%;
-        height: 200px; /* Reduced height */
-        object-fit: cover;
-    }}
-    @keyframes slide-in {{
-        from {{
-            transform: translateY(-100%);
-            opacity: 0;
-        }}
-        to {{
-            transform: translateY(0);
-            opacity: 1;
-        }}
-    }}
-    </style>
-    """, unsafe_allow_html=True)    
-    
-    
 def show_announcement(messages):
     """Displays an animated announcement with scrolling messages and Peter Griffin GIF."""
     gif_path = "images/Peter Griffin Dancing.gif"  # Make sure this path is correct
     
     messages_cycle = cycle(messages)
-    # Read and encode the GIF file
-    with open(gif_path, "rb") as gif_file:
-        gif_data = gif_file.read()
-        gif_base64 = base64.b64encode(gif_data).decode("utf-8")
+    # Served by content-hash URL so reruns don't re-send the GIF
+    gif_src = asset_url(gif_path)
 
     messages_json = json.dumps(messages)
     st.markdown(
         f"""
     <div class="announcement-container">
-        <img src="data:image/gif;base64,{gif_base64}" alt="Peter Griffin GIF" class="peter-gif"> 
+        <img src="{gif_src}" alt="Peter Griffin GIF" class="peter-gif"> 
         <div class="announcement-content">
             <div class="announcement-text" id="scrolling-text"></div> 
         </div>
@@ -186,16 +141,12 @@ def show_announcement(messages):
     """, unsafe_allow_html=True)
     
 
-def set_background(image_file, is_gif=False):
-    """Sets the background image of the Streamlit app."""
-    with open(image_file, "rb") as f:
-        img_data = f.read()
-    b64_encoded = base64.b64encode(img_data).decode()
-    img_type = "gif" if is_gif else "png"
+def set_background(image_file):
+    """Sets the background image of the Streamlit app; animated backgrounds go through media.video_background."""
     style = f"""
         <style>
+        {background_css(image_file)}
         .stApp {{
-            background-image: url(data:image/{img_type};base64,{b64_encoded});
             background-size: cover;
             background-attachment: fixed;
         }}
@@ -204,7 +155,8 @@ def set_background(image_file, is_gif=False):
     st.markdown(style, unsafe_allow_html=True)
 
 def get_binary_file_downloader_html(bin_file, file_label='File'):
-    bin_str = base64.b64encode(bin_file).decode()
+    """Builds a download link for raw bytes or a file path, via the shared base64 cache."""
+    bin_str = encode_file(bin_file) if isinstance(bin_file, str) else encode_bytes(bin_file)
     href = f'<a href="data:application/octet-stream;base64,{bin_str}" download="{file_label}">Download {file_label}</a>'
     return href
 
@@ -213,9 +165,7 @@ def get_resume_file_path(role, document_type):
     return f"resume/{role.lower().replace(' ', '_')}_{file_type}.pdf"
 
 def display_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
+    pdf_display = f'<iframe src="{asset_url(file_path)}" width="700" height="1000" type="application/pdf"></iframe>'
     st.markdown(pdf_display, unsafe_allow_html=True)
 
 def display_resume_section(role):
@@ -231,7 +181,7 @@ def display_resume_section(role):
     try:
         display_pdf(file_path)
         with col2:
-            st.markdown(get_binary_file_downloader_html(open(file_path, "rb").read(), file_label), unsafe_allow_html=True)
+            st.markdown(get_binary_file_downloader_html(file_path, file_label), unsafe_allow_html=True)
     except FileNotFoundError:
         st.error(f"The {file_label} file was not found. Please check if the file exists in the 'resume' folder.")
 
@@ -253,7 +203,7 @@ def display_contact_form():
     st.markdown("<h2 style='text-align: center; color: #4A4A4A;'>Send me a message</h2>", unsafe_allow_html=True)
     
     # Load Lottie animation
-    lottie_contact = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_u25cckyh.json")
+    lottie_contact = load_lottieurl(ANIMATIONS["contact_form"])
     
     col1, col2 = st.columns([1, 2])
     
@@ -291,7 +241,7 @@ def display_contact_form():
                     st.video(video_bytes)
                     
                     # Add a fun animation on successful submission
-                    success_animation = load_lottieurl("https://assets2.lottiefiles.com/packages/lf20_touohxv0.json")
+                    success_animation = load_lottieurl(ANIMATIONS["contact_success"])
                     if success_animation:
                         st_lottie(success_animation, key="success_animation", height=200)
                     else:
@@ -303,7 +253,7 @@ def contact_section(role):
     st.markdown("<h1 style='text-align: center; color: #2E86C1;'>Contact Me</h1>", unsafe_allow_html=True)
     
     # Load Lottie animation for contact info
-    lottie_contact_info = load_lottieurl("https://assets3.lottiefiles.com/packages/lf20_fclga8fl.json")
+    lottie_contact_info = load_lottieurl(ANIMATIONS["contact_info"])
     
     col1, col2 = st.columns([1, 2])
     
@@ -1,18 +1,15 @@
 import streamlit as st
 from streamlit_lottie import st_lottie
-import requests
+from animations import ANIMATIONS, load_animation
 import random  # Import the random module
 
 # ... rest of your code ...
 
 def load_lottieurl(url: str):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
+    return load_animation(url)
 
 # --- Load Lottie Animation ---
-lottie_coding = load_lottieurl("https://assets10.lottiefiles.com/packages/lf20_vnikrcia.json")  # Replace with your chosen animation URL
+lottie_coding = load_lottieurl(ANIMATIONS["hero_coding"])  # Replace with your chosen animation URL
 
 # --- Particle Animation CSS ---
 st.markdown(